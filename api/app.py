@@ -1,8 +1,19 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from api.routes import health, campaigns, leads
+from starlette.concurrency import run_in_threadpool
+from clients.transport import warm_all
+from api.routes import health, campaigns, leads, webhooks, dispatch
 
-app = FastAPI(title="Lead Enrichment API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pay DNS + TLS setup before the first request, not during it
+    await run_in_threadpool(warm_all)
+    yield
+
+
+app = FastAPI(title="Lead Enrichment API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -14,3 +25,5 @@ app.add_middleware(
 app.include_router(health.router)
 app.include_router(campaigns.router)
 app.include_router(leads.router)
+app.include_router(webhooks.router)
+app.include_router(dispatch.router)
@@ -1,6 +1,7 @@
 from functools import lru_cache
 from clients.aturiya import AturiyaClient
 from clients.pipe0 import Pipe0Client
+from clients.dispatch import INTERACTIVE, Pipe0Dispatcher, get_dispatcher, get_lane_client
 
 
 @lru_cache
@@ -8,6 +9,10 @@ def get_aturiya_client() -> AturiyaClient:
     return AturiyaClient()
 
 
-@lru_cache
 def get_pipe0_client() -> Pipe0Client:
-    return Pipe0Client()
+    """pipe0 client for runtime requests — scheduled on the interactive lane."""
+    return get_lane_client(INTERACTIVE)
+
+
+def get_pipe0_dispatcher() -> Pipe0Dispatcher:
+    return get_dispatcher()
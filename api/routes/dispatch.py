@@ -0,0 +1,10 @@
+from fastapi import APIRouter, Depends
+from clients.dispatch import Pipe0Dispatcher
+from api.deps import get_pipe0_dispatcher
+
+router = APIRouter()
+
+
+@router.get("/api/dispatch/stats")
+def dispatch_stats(dispatcher: Pipe0Dispatcher = Depends(get_pipe0_dispatcher)):
+    return dispatcher.stats()
@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from clients.aturiya import AturiyaClient
 from clients.pipe0 import Pipe0Client
+from clients.dispatch import DispatchRejected
 from models.lead import RawLead
 from api.deps import get_aturiya_client, get_pipe0_client
 from pipeline.enrich import enrich_one
@@ -21,7 +22,11 @@ def get_leads(
 def enrich_lead(
     lead_id: str,
     raw: RawLead,
+    use_async: bool = False,
     pipe0: Pipe0Client = Depends(get_pipe0_client),
 ):
-    enriched = enrich_one(raw, client=pipe0)
+    try:
+        enriched = enrich_one(raw, client=pipe0, use_async=use_async)
+    except DispatchRejected as e:
+        raise HTTPException(status_code=503, detail=str(e))
     return enriched.model_dump()
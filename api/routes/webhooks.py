@@ -0,0 +1,36 @@
+import json
+from fastapi import APIRouter, Header, HTTPException, Request
+from clients.pipe0 import Pipe0Client
+from clients.runs import run_registry
+
+router = APIRouter()
+
+
+@router.post("/api/webhooks/pipe0")
+async def pipe0_webhook(
+    request: Request,
+    x_pipe0_signature: str | None = Header(default=None),
+):
+    """Receive pipe0 async-run completion callbacks.
+
+    The payload has the same shape as `/v1/pipes/check/{run_id}`; it is
+    handed to whoever is blocked in `Pipe0Client.wait_for_run` for that run.
+    """
+    body = await request.body()
+    if not Pipe0Client.verify_webhook(body, x_pipe0_signature):
+        raise HTTPException(status_code=401, detail="Invalid webhook signature")
+
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Malformed JSON payload")
+
+    run_id = payload.get("id") if isinstance(payload, dict) else None
+    if not run_id:
+        raise HTTPException(status_code=400, detail="Missing run id")
+
+    if payload.get("status") not in ("completed", "failed"):
+        return {"status": "ignored", "run_id": run_id}
+
+    accepted = run_registry.resolve(run_id, payload)
+    return {"status": "accepted" if accepted else "duplicate", "run_id": run_id}
@@ -0,0 +1,190 @@
+"""
+Signal parsing benchmark
+========================
+Measures parse throughput (pipe0 response -> EnrichedLead) of the signal
+registry path against the previous hand-written parse/merge code.
+
+Pass one or more recorded pipe0 responses (JSON saved from
+`/v1/pipes/run/sync` or `/v1/pipes/check/{run_id}`) to benchmark on real
+data; their records are replicated up to --records. Without any, a
+synthetic response with realistic field mixes is generated.
+
+Usage:
+    python benchmarks/parse_bench.py --records 20000
+    python benchmarks/parse_bench.py --response output/run_*.json
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from clients.pipe0 import Pipe0Client  # noqa: E402
+from models.lead import CompanyOverview, EnrichedLead, EnrichmentMetadata, FundingInfo, RawLead  # noqa: E402
+from pipeline.enrich import _merge_lead  # noqa: E402
+
+
+def _legacy_parse(pipe0_response: dict, batch_index_map: dict[int, str]) -> dict[str, dict]:
+    """parse_enrichment as it was before the signal registry."""
+    records = pipe0_response.get("records", {})
+    results = {}
+    for rec_id_str, record in records.items():
+        rec_id = int(rec_id_str) if rec_id_str.isdigit() else record.get("id")
+        lead_id = batch_index_map.get(rec_id)
+        if not lead_id:
+            continue
+        enriched = {}
+        signals_found = []
+        signals_missed = []
+        for field_name, field_data in record.get("fields", {}).items():
+            resolved_by = field_data.get("resolved_by") or {}
+            if resolved_by.get("ref") == "input":
+                continue
+            status = field_data.get("status", "")
+            value = field_data.get("value")
+            if status == "completed" and value is not None:
+                enriched[field_name] = value
+                signals_found.append(field_name)
+            else:
+                signals_missed.append(field_name)
+        enriched["_signals_found"] = signals_found
+        enriched["_signals_missed"] = signals_missed
+        enriched["_run_id"] = pipe0_response.get("id")
+        results[lead_id] = enriched
+    return results
+
+
+def _legacy_merge(raw: RawLead, enrichment: dict) -> EnrichedLead:
+    """_merge_lead as it was before the signal registry."""
+    company_overview = None
+    if any(
+        k in enrichment
+        for k in ("company_description", "company_industry", "headcount",
+                  "founded_year", "company_region", "estimated_revenue")
+    ):
+        company_overview = CompanyOverview(
+            description=enrichment.get("company_description"),
+            industry=enrichment.get("company_industry"),
+            headcount=enrichment.get("headcount"),
+            founded_year=enrichment.get("founded_year"),
+            region=enrichment.get("company_region"),
+            estimated_revenue=enrichment.get("estimated_revenue"),
+        )
+    funding = None
+    if "funding_history" in enrichment or "funding_total_usd" in enrichment:
+        funding = FundingInfo(
+            total_funding_usd=enrichment.get("funding_total_usd"),
+            funding_history=enrichment.get("funding_history"),
+            news_summary=enrichment.get("company_news_summary"),
+        )
+    linkedin_posts = None
+    post_data = enrichment.get("crustdata_post_list")
+    if post_data and isinstance(post_data, list):
+        linkedin_posts = [p.get("text", str(p)) if isinstance(p, dict) else str(p) for p in post_data[:5]]
+    elif enrichment.get("post_list_string"):
+        linkedin_posts = [enrichment["post_list_string"]]
+    metadata = EnrichmentMetadata(
+        signals_found=enrichment.get("_signals_found", []),
+        signals_missed=enrichment.get("_signals_missed", []),
+        pipe0_run_id=enrichment.get("_run_id"),
+    )
+    return EnrichedLead(
+        lead_id=raw.lead_id,
+        name=raw.name,
+        email=raw.email,
+        phone=raw.phone,
+        organization=raw.organization,
+        designation=raw.designation,
+        linkedin_url=raw.linkedin_url,
+        campaign_id=raw.campaign_id,
+        campaign_name=raw.campaign_name,
+        company_overview=company_overview,
+        tech_stack=enrichment.get("technology_list"),
+        funding=funding,
+        linkedin_posts=linkedin_posts,
+        enrichment_metadata=metadata,
+    )
+
+
+def _synthetic_record(rnd: random.Random, i: int) -> dict:
+    def field(value):
+        roll = rnd.random()
+        if roll < 0.2:
+            return {"status": "no_result", "value": None, "resolved_by": None}
+        if roll < 0.25:
+            return {"status": "completed", "value": value, "resolved_by": {"ref": "input"}}
+        return {"status": "completed", "value": value, "resolved_by": {"ref": "pipe", "pipe_id": "x"}}
+
+    return {
+        "id": i,
+        "fields": {
+            "company_website_url": field("acme.io"),
+            "company_name": field("Acme"),
+            "profile_url": field("https://www.linkedin.com/in/jane-doe"),
+            "company_description": field(f"Acme {i} builds developer tooling for data teams."),
+            "company_industry": field("Software"),
+            "headcount": field("51-200"),
+            "founded_year": field("2016"),
+            "company_region": field("North America"),
+            "estimated_revenue": field("$10M-$50M"),
+            "technology_list": field(["React", "AWS", "Segment", "HubSpot", "Stripe"]),
+            "funding_total_usd": field(25_000_000),
+            "funding_history": field([{"round": "Series A", "amount_usd": 25_000_000}]),
+            "company_news_summary": field("Acme launched a new product line."),
+            "crustdata_post_list": field([{"text": f"Post {k}"} for k in range(8)]),
+        },
+    }
+
+
+def _load_records(paths: list[str], total: int) -> list[dict]:
+    if not paths:
+        rnd = random.Random(0)
+        return [_synthetic_record(rnd, i) for i in range(1, total + 1)]
+    recorded = []
+    for path in paths:
+        recorded.extend(json.loads(Path(path).read_text()).get("records", {}).values())
+    if not recorded:
+        raise SystemExit("No records found in the given responses")
+    return [dict(recorded[i % len(recorded)], id=i + 1) for i in range(total)]
+
+
+def _bench(label: str, parse, merge, response: dict, index_map: dict, raws: dict, rounds: int) -> None:
+    best_parse = best_total = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        parsed = parse(response, index_map)
+        mid = time.perf_counter()
+        for lead_id, enrichment in parsed.items():
+            merge(raws[lead_id], enrichment)
+        end = time.perf_counter()
+        best_parse = min(best_parse, mid - start)
+        best_total = min(best_total, end - start)
+    n = len(index_map)
+    print(f"{label:<10} parse {n / best_parse:>10,.0f} rec/s   parse+merge {n / best_total:>9,.0f} rec/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="pipe0 response parsing benchmark")
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--response", nargs="*", default=[], help="Recorded pipe0 response JSON files")
+    args = parser.parse_args()
+
+    records = _load_records(args.response, args.records)
+    response = {"id": "bench", "status": "completed", "records": {str(r["id"]): r for r in records}}
+    index_map = {r["id"]: f"lead-{r['id']}" for r in records}
+    raws = {
+        lead_id: RawLead(lead_id=lead_id, agent_id="a", campaign_id="c", name="Jane Doe")
+        for lead_id in index_map.values()
+    }
+
+    print(f"{len(records):,} records, best of {args.rounds}")
+    _bench("legacy", _legacy_parse, _legacy_merge, response, index_map, raws, args.rounds)
+    _bench("registry", Pipe0Client.parse_enrichment, _merge_lead, response, index_map, raws, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
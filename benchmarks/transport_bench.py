@@ -0,0 +1,129 @@
+"""
+Transport microbenchmark
+========================
+Compares per-request overhead against a local HTTP/1.1 server for:
+
+- bare:      the old setup — a default requests.Session
+- fresh:     a new connection per request (what a cold start pays each time)
+- transport: clients.transport.Transport (shared keep-alive pool, timeouts)
+- gzip:      transport with a large pipe0-style JSON body, compressed vs not
+
+Loopback has no bandwidth cost, so the gzip rows show only the CPU price
+of compression; the win is on real links, where a ~70 KiB batch body
+shrinks by an order of magnitude.
+
+Usage:
+    python benchmarks/transport_bench.py --requests 500 --body-kb 64
+"""
+
+import argparse
+import json
+import socket
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from clients.transport import Transport  # noqa: E402
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out as separate writes; without this, Nagle +
+        # delayed ACK adds ~40 ms to every keep-alive response
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def _reply(self):
+        length = int(self.headers.get("Content-Length", 0))
+        if length:
+            self.rfile.read(length)
+        body = b'{"status": "completed"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_HEAD = do_POST = _reply
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass  # clients dropping idle keep-alive connections
+
+
+def _time(fn, n: int) -> list[float]:
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return samples
+
+
+def _report(label: str, samples: list[float]) -> None:
+    samples.sort()
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{label:<28} median {statistics.median(samples):8.1f} us   p95 {p95:8.1f} us")
+
+
+def _payload(kb: int) -> dict:
+    """pipe0-style run body of roughly `kb` KiB."""
+    entry = {
+        "company_name": "Acme Corporation",
+        "company_website_url": "acme.io",
+        "profile_url": "https://www.linkedin.com/in/jane-doe",
+    }
+    size = len(json.dumps(entry))
+    inputs = [dict(entry, id=i + 1) for i in range(max(1, kb * 1024 // size))]
+    return {"pipes": [{"pipe_id": "company:overview@2"}], "input": inputs, "config": {"environment": "sandbox"}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP transport microbenchmark")
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--body-kb", type=int, default=64)
+    args = parser.parse_args()
+
+    server = _Server(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/v1/pipes/check/x"
+    n = args.requests
+
+    bare = requests.Session()
+    transport = Transport(url.rsplit("/v1", 1)[0], timeouts={"default": (3.05, 10)})
+    tuned = transport.session()
+    transport.warm()
+
+    print(f"GET, {n} requests each")
+    _report("fresh connection", _time(lambda: requests.get(url), n))
+    _report("bare requests.Session", _time(lambda: bare.get(url), n))
+    _report("transport session", _time(lambda: tuned.get(url), n))
+
+    payload = _payload(args.body_kb)
+    raw = len(json.dumps(payload).encode())
+    plain = Transport(transport.base_url).session()
+    gzipped = Transport(transport.base_url, gzip_min_bytes=1).session()
+    post_url = url.replace("check/x", "run")
+    print(f"\nPOST {raw / 1024:.0f} KiB JSON body, {n} requests each")
+    _report("transport, uncompressed", _time(lambda: plain.post(post_url, json=payload), n))
+    _report("transport, gzip", _time(lambda: gzipped.post(post_url, json=payload), n))
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
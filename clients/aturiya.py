@@ -1,7 +1,7 @@
 import logging
-import requests
 from models.lead import RawLead
 import config
+from clients.transport import get_transport
 
 logger = logging.getLogger(__name__)
 
@@ -14,8 +14,7 @@ class AturiyaClient:
         self.token = token or config.ATURIYA_BEARER_TOKEN
         self.user_id = config.ATURIYA_USER_ID
         self.agent_id = config.ATURIYA_AGENT_ID
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.session = get_transport("aturiya").session({
             "Authorization": f"Bearer {self.token}",
         })
 
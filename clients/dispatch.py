@@ -0,0 +1,184 @@
+import logging
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from clients.pipe0 import Pipe0Client
+from storage.queue import default_worker_id
+from storage.slots import SlotTable
+import config
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+BACKFILL = "backfill"
+LANES = (INTERACTIVE, BULK, BACKFILL)
+
+
+class DispatchRejected(RuntimeError):
+    """Raised when a lane's queue is full and the request is not admitted."""
+
+
+class Pipe0Dispatcher:
+    """Shared admission/scheduling layer in front of pipe0.
+
+    Every pipe0 run takes one of `capacity` slots. Requests queue per lane:
+
+    - interactive requests are always dispatched first (they jump ahead of
+      queued bulk/backfill work) and `reserved` slots are kept free for them;
+    - bulk and backfill share the remaining slots by weighted fair queuing,
+      with a request's cost equal to the number of records it sends;
+    - each lane has a maximum queue depth beyond which new requests are
+      rejected with `DispatchRejected`.
+
+    Slots and queues live in a `SlotTable` (`DISPATCH_DB_PATH`), so the API,
+    `main.py` and every `worker.py` process share one budget. Waiting
+    requests check their ticket with a cheap read; slots are granted when
+    a ticket is submitted or released anywhere. A background thread
+    heartbeats this process's tickets (queued or granted) and runs the
+    scheduler, so slots held by a crashed process are reclaimed.
+    """
+
+    def __init__(
+        self,
+        capacity: int | None = None,
+        reserved: int | None = None,
+        weights: dict[str, float] | None = None,
+        max_queue: dict[str, int] | None = None,
+        path: str | Path | None = None,
+    ):
+        self.capacity = capacity or config.PIPE0_MAX_CONCURRENCY
+        self.reserved = config.PIPE0_INTERACTIVE_RESERVED if reserved is None else reserved
+        self.weights = weights or config.PIPE0_LANE_WEIGHTS
+        self.max_queue = max_queue or config.PIPE0_LANE_MAX_QUEUE
+        if self.reserved >= self.capacity:
+            raise ValueError("Reserved interactive slots must be fewer than total capacity")
+
+        self.slots = SlotTable(
+            self.capacity,
+            self.reserved,
+            self.weights,
+            self.max_queue,
+            priority_lane=INTERACTIVE,
+            path=path,
+        )
+        self.owner = default_worker_id()
+        # Wakes local waiters as soon as this process frees a slot
+        self._cond = threading.Condition()
+        # Tickets of this process, queued or granted, kept alive by _beat
+        self._tickets: set[int] = set()
+        self._heartbeat: threading.Thread | None = None
+
+    def _start_heartbeat(self) -> None:
+        """Start the heartbeat thread on first use. Caller holds the lock."""
+        if self._heartbeat is None:
+            self._heartbeat = threading.Thread(target=self._beat, name="pipe0-dispatch-heartbeat", daemon=True)
+            self._heartbeat.start()
+
+    def _beat(self) -> None:
+        while True:
+            time.sleep(self.slots.ticket_ttl / 3)
+            with self._cond:
+                tickets = list(self._tickets)
+            try:
+                self.slots.touch(tickets)
+            except sqlite3.Error as e:
+                logger.warning("Dispatch heartbeat failed: %s", e)
+
+    def acquire(self, lane: str, cost: int = 1) -> int:
+        """Block until a slot is granted to this request on `lane`; returns its ticket."""
+        if lane not in self.weights:
+            raise ValueError(f"Unknown dispatch lane: {lane}")
+        ticket = self.slots.submit(lane, cost, self.owner)
+        if ticket is None:
+            raise DispatchRejected(f"{lane} lane is full")
+        with self._cond:
+            self._tickets.add(ticket)
+            self._start_heartbeat()
+        try:
+            while not (granted := self.slots.poll(ticket)):
+                if granted is None:
+                    raise DispatchRejected(f"{lane} ticket {ticket} expired while queued")
+                with self._cond:
+                    self._cond.wait(config.DISPATCH_POLL_INTERVAL)
+        except BaseException:
+            self.release(ticket)
+            raise
+        return ticket
+
+    def release(self, ticket: int) -> None:
+        """Return a slot taken by `acquire`."""
+        self.slots.release(ticket)
+        with self._cond:
+            self._tickets.discard(ticket)
+            self._cond.notify_all()
+
+    def run(self, lane: str, fn, *args, cost: int = 1, **kwargs):
+        """Call `fn(*args, **kwargs)` once a slot on `lane` is granted."""
+        ticket = self.acquire(lane, cost)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.release(ticket)
+
+    def stats(self) -> dict:
+        """Queue depth, in-flight count and wait times per lane (all processes)."""
+        return self.slots.stats()
+
+
+class DispatchedPipe0Client(Pipe0Client):
+    """Pipe0Client whose runs are scheduled through a `Pipe0Dispatcher` lane.
+
+    An async run keeps its slot until `wait_for_run` returns for it, so
+    every `enrich_async` must be followed by a `wait_for_run`.
+    """
+
+    def __init__(self, dispatcher: Pipe0Dispatcher, lane: str, api_key: str | None = None):
+        super().__init__(api_key=api_key)
+        self.dispatcher = dispatcher
+        self.lane = lane
+        self._lock = threading.Lock()
+        # run_id -> ticket of an async run that is still holding its slot
+        self._async_tickets: dict[str, int] = {}
+
+    def enrich_sync(self, leads_batch: list[dict]) -> dict:
+        return self.dispatcher.run(
+            self.lane, super().enrich_sync, leads_batch, cost=len(leads_batch)
+        )
+
+    def enrich_async(self, leads_batch: list[dict]) -> str:
+        ticket = self.dispatcher.acquire(self.lane, len(leads_batch))
+        try:
+            run_id = super().enrich_async(leads_batch)
+        except BaseException:
+            self.dispatcher.release(ticket)
+            raise
+        if not run_id:
+            self.dispatcher.release(ticket)
+            return run_id
+        with self._lock:
+            self._async_tickets[run_id] = ticket
+        return run_id
+
+    def wait_for_run(self, run_id: str, *args, **kwargs) -> dict:
+        try:
+            return super().wait_for_run(run_id, *args, **kwargs)
+        finally:
+            with self._lock:
+                ticket = self._async_tickets.pop(run_id, None)
+            if ticket is not None:
+                self.dispatcher.release(ticket)
+
+
+@lru_cache
+def get_dispatcher() -> Pipe0Dispatcher:
+    """This process's dispatcher, shared by every lane client."""
+    return Pipe0Dispatcher()
+
+
+@lru_cache
+def get_lane_client(lane: str) -> DispatchedPipe0Client:
+    """Shared pipe0 client for `lane`."""
+    return DispatchedPipe0Client(get_dispatcher(), lane)
@@ -1,19 +1,15 @@
+import hashlib
+import hmac
 import logging
 import time
-import requests
 import config
+from clients.transport import get_transport
+from clients.runs import run_registry
+from models.signals import PIPES, parse_fields
+from utils.identity import company_domain
 
 logger = logging.getLogger(__name__)
 
-# Pipe IDs for each enrichment signal
-PIPES = {
-    "company_overview": "company:overview@2",
-    "tech_stack": "company:techstack:builtwith@1",
-    "funding": "company:funding:leadmagic@1",
-    "news": "company:newssummary:website@1",
-    "linkedin_posts": "people:posts:crustdata@1",
-}
-
 
 class Pipe0Client:
     """Client for the pipe0 enrichment API."""
@@ -21,8 +17,7 @@ class Pipe0Client:
     def __init__(self, api_key: str | None = None):
         self.base_url = config.PIPE0_BASE_URL
         self.api_key = api_key or config.PIPE0_API_KEY
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.session = get_transport("pipe0").session({
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
         })
@@ -31,7 +26,8 @@ class Pipe0Client:
         """Build the pipes array based on enabled enrichment signals."""
         pipes = []
         for signal, pipe_id in PIPES.items():
-            if config.ENRICHMENT_PIPES.get(signal, False):
+            # Registry signals are on unless ENRICHMENT_PIPES turns them off
+            if config.ENRICHMENT_PIPES.get(signal, True):
                 pipes.append({"pipe_id": pipe_id})
         return pipes
 
@@ -48,17 +44,10 @@ class Pipe0Client:
 
             # Company identification — derive domain from email if no website
             org = lead.get("organization", "")
-            email = lead.get("email", "")
-            website = lead.get("website")
-
-            if website:
-                entry["company_website_url"] = website
-            elif email and "@" in email:
-                domain = email.split("@")[1]
-                # Skip generic email providers
-                generic = {"gmail.com", "yahoo.com", "hotmail.com", "outlook.com"}
-                if domain not in generic:
-                    entry["company_website_url"] = domain
+            domain = company_domain(lead.get("email"), lead.get("website"))
+
+            if domain:
+                entry["company_website_url"] = domain
             if org:
                 entry["company_name"] = org
 
@@ -114,6 +103,8 @@ class Pipe0Client:
             "input": self._build_input(leads_batch),
             "config": {"environment": config.PIPE0_ENVIRONMENT},
         }
+        if config.PIPE0_WEBHOOK_URL:
+            payload["config"]["webhook_url"] = config.PIPE0_WEBHOOK_URL
 
         resp = self.session.post(
             f"{self.base_url}/v1/pipes/run",
@@ -122,6 +113,8 @@ class Pipe0Client:
         resp.raise_for_status()
         data = resp.json()
         run_id = data.get("id", "")
+        if run_id and config.PIPE0_WEBHOOK_URL:
+            run_registry.expect(run_id)
         logger.info("pipe0 async run started: %s", run_id)
         return run_id
 
@@ -132,17 +125,44 @@ class Pipe0Client:
         return resp.json()
 
     def wait_for_run(self, run_id: str, timeout: int = 120, interval: int = 3) -> dict:
-        """Poll an async run until it completes or times out."""
+        """Wait for an async run to complete or time out.
+
+        With a webhook configured, the run is resolved by the callback and
+        polling only happens every PIPE0_POLL_FALLBACK_INTERVAL seconds in
+        case a delivery is lost. Without one, polls every `interval` seconds.
+        """
+        webhook = bool(config.PIPE0_WEBHOOK_URL)
+        if webhook:
+            interval = max(interval, config.PIPE0_POLL_FALLBACK_INTERVAL)
         start = time.time()
-        while time.time() - start < timeout:
-            result = self.check_run(run_id)
-            status = result.get("status", "")
-            if status in ("completed", "failed"):
-                return result
-            logger.debug("Run %s still %s, waiting...", run_id, status)
-            time.sleep(interval)
+        try:
+            while time.time() - start < timeout:
+                if webhook:
+                    remaining = timeout - (time.time() - start)
+                    result = run_registry.wait(run_id, min(interval, remaining))
+                    if result is not None:
+                        return result
+                result = self.check_run(run_id)
+                status = result.get("status", "")
+                if status in ("completed", "failed"):
+                    return result
+                logger.debug("Run %s still %s, waiting...", run_id, status)
+                if not webhook:
+                    time.sleep(interval)
+        finally:
+            if webhook:
+                run_registry.pop(run_id)
         raise TimeoutError(f"pipe0 run {run_id} did not complete within {timeout}s")
 
+    @staticmethod
+    def verify_webhook(body: bytes, signature: str | None) -> bool:
+        """Check a webhook's `X-Pipe0-Signature` (hex HMAC-SHA256 of the raw body)."""
+        secret = config.PIPE0_WEBHOOK_SECRET
+        if not secret or not signature:
+            return False
+        expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+        return hmac.compare_digest(expected, signature.removeprefix("sha256="))
+
     @staticmethod
     def parse_enrichment(pipe0_response: dict, batch_index_map: dict[int, str]) -> dict[str, dict]:
         """Parse pipe0 response into a dict keyed by lead_id.
@@ -155,6 +175,7 @@ class Pipe0Client:
             {lead_id: {field_name: value, ...}} for each lead.
         """
         records = pipe0_response.get("records", {})
+        run_id = pipe0_response.get("id")
         results = {}
 
         for rec_id_str, record in records.items():
@@ -163,29 +184,10 @@ class Pipe0Client:
             if not lead_id:
                 continue
 
-            fields = record.get("fields", {})
-            enriched = {}
-            signals_found = []
-            signals_missed = []
-
-            for field_name, field_data in fields.items():
-                # Skip input echo fields
-                resolved_by = field_data.get("resolved_by") or {}
-                if resolved_by.get("ref") == "input":
-                    continue
-
-                status = field_data.get("status", "")
-                value = field_data.get("value")
-
-                if status == "completed" and value is not None:
-                    enriched[field_name] = value
-                    signals_found.append(field_name)
-                else:
-                    signals_missed.append(field_name)
-
+            enriched, signals_found, signals_missed = parse_fields(record.get("fields", {}))
             enriched["_signals_found"] = signals_found
             enriched["_signals_missed"] = signals_missed
-            enriched["_run_id"] = pipe0_response.get("id")
+            enriched["_run_id"] = run_id
             results[lead_id] = enriched
 
         return results
@@ -0,0 +1,90 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class _PendingRun:
+    def __init__(self):
+        self.event = threading.Event()
+        self.response: dict | None = None
+        self.created = time.time()
+
+
+class RunRegistry:
+    """In-process rendezvous between pipe0 webhook callbacks and waiters.
+
+    `Pipe0Client.enrich_async` registers each run it starts; the webhook
+    route resolves it when pipe0 reports completion, waking whichever
+    request or job is blocked in `wait`. A callback that arrives before
+    the run is registered is kept until someone asks for it. Runs that
+    were already collected are remembered for `TTL`, so a late duplicate
+    delivery is reported as such instead of being stored again.
+
+    The registry lives in one process, so the API must run as a single
+    uvicorn worker when webhooks are enabled: a callback delivered to
+    another worker only reaches the waiter via the slow fallback poll.
+    """
+
+    # Forget runs nobody collected after this long
+    TTL = 3600
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._runs: dict[str, _PendingRun] = {}
+        # run_id -> time it was collected
+        self._done: dict[str, float] = {}
+
+    def _get(self, run_id: str) -> _PendingRun:
+        run = self._runs.get(run_id)
+        if run is None:
+            run = self._runs[run_id] = _PendingRun()
+        return run
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.TTL
+        for run_id in [r for r, run in self._runs.items() if run.created < cutoff]:
+            del self._runs[run_id]
+        for run_id in [r for r, done_at in self._done.items() if done_at < cutoff]:
+            del self._done[run_id]
+
+    def expect(self, run_id: str) -> None:
+        """Register a run so its webhook result can be awaited."""
+        with self._lock:
+            self._prune()
+            self._get(run_id)
+
+    def resolve(self, run_id: str, response: dict) -> bool:
+        """Store a finished run's payload and wake its waiters.
+
+        Returns False if the run was already resolved (duplicate delivery).
+        """
+        with self._lock:
+            self._prune()
+            if run_id in self._done:
+                return False
+            run = self._get(run_id)
+            if run.event.is_set():
+                return False
+            run.response = response
+            run.event.set()
+        logger.info("pipe0 run %s resolved via webhook", run_id)
+        return True
+
+    def wait(self, run_id: str, timeout: float) -> dict | None:
+        """Block until the run is resolved; returns its payload or None on timeout."""
+        with self._lock:
+            run = self._get(run_id)
+        if not run.event.wait(timeout):
+            return None
+        return run.response
+
+    def pop(self, run_id: str) -> None:
+        """Drop a run once its waiter is done with it."""
+        with self._lock:
+            self._runs.pop(run_id, None)
+            self._done[run_id] = time.time()
+
+
+run_registry = RunRegistry()
@@ -0,0 +1,131 @@
+import gzip
+import json
+import logging
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+import config
+
+logger = logging.getLogger(__name__)
+
+
+class _KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter whose sockets have TCP keep-alive enabled."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        options = [(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1), (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+        for name, value in (("TCP_KEEPIDLE", 60), ("TCP_KEEPINTVL", 15), ("TCP_KEEPCNT", 4)):
+            if hasattr(socket, name):
+                options.append((socket.IPPROTO_TCP, getattr(socket, name), value))
+        kwargs["socket_options"] = options
+        super().init_poolmanager(*args, **kwargs)
+
+
+class TransportSession(requests.Session):
+    """requests.Session that applies its Transport's timeouts and compression."""
+
+    def __init__(self, transport: "Transport"):
+        super().__init__()
+        self.transport = transport
+        self.mount("https://", transport.adapter)
+        self.mount("http://", transport.adapter)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.transport.timeout_for(url))
+        payload = kwargs.get("json")
+        min_bytes = self.transport.gzip_min_bytes
+        if payload is not None and min_bytes and kwargs.get("data") is None:
+            body = json.dumps(payload).encode("utf-8")
+            if len(body) >= min_bytes:
+                kwargs.pop("json")
+                kwargs["data"] = gzip.compress(body, compresslevel=5)
+                headers = dict(kwargs.get("headers") or {})
+                headers["Content-Encoding"] = "gzip"
+                headers["Content-Type"] = "application/json"
+                kwargs["headers"] = headers
+        return super().request(method, url, **kwargs)
+
+    def close(self):
+        # Connection pools belong to the shared transport, not to this session
+        pass
+
+
+class Transport:
+    """Pooled, keep-alive HTTP transport shared by every client of one API.
+
+    All sessions created by `session()` share the same connection pools, so
+    e.g. each Pipe0Client (one per dispatch lane) reuses warm connections
+    instead of opening its own. Timeouts are (connect, read) tuples looked
+    up by the longest matching path prefix in `timeouts`.
+
+    requests/urllib3 only speak HTTP/1.1, so connection reuse comes from
+    keep-alive pooling rather than HTTP/2 multiplexing.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        pool_maxsize: int = 10,
+        timeouts: dict[str, tuple[float, float]] | None = None,
+        gzip_min_bytes: int = 0,
+    ):
+        self.base_url = base_url
+        self.pool_maxsize = pool_maxsize
+        self.timeouts = timeouts or {}
+        self.gzip_min_bytes = gzip_min_bytes
+        self.adapter = _KeepAliveAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+
+    def timeout_for(self, url: str) -> tuple[float, float] | None:
+        path = urlsplit(url).path
+        match = max((p for p in self.timeouts if p != "default" and path.startswith(p)), key=len, default="default")
+        return self.timeouts.get(match)
+
+    def session(self, headers: dict | None = None) -> TransportSession:
+        session = TransportSession(self)
+        if headers:
+            session.headers.update(headers)
+        return session
+
+    def warm(self, connections: int = 1) -> float:
+        """Open `connections` pooled connections (DNS + TCP + TLS) ahead of use.
+
+        Any HTTP response counts as warm; network errors are logged, not
+        raised. Requests use the short HTTP_WARM_TIMEOUT, so a slow host
+        can't hold up startup. Returns the elapsed time in seconds.
+        """
+        start = time.perf_counter()
+        session = self.session()
+
+        def _touch(_):
+            try:
+                session.head(self.base_url, timeout=config.HTTP_WARM_TIMEOUT, allow_redirects=False)
+            except requests.RequestException as e:
+                logger.warning("Warming %s failed: %s", self.base_url, e)
+
+        with ThreadPoolExecutor(max_workers=max(connections, 1)) as pool:
+            list(pool.map(_touch, range(max(connections, 1))))
+        elapsed = time.perf_counter() - start
+        logger.info("Warmed %d connection(s) to %s in %.0f ms", connections, self.base_url, elapsed * 1000)
+        return elapsed
+
+
+@lru_cache
+def get_transport(name: str) -> Transport:
+    """Shared transport for `name` ("aturiya" or "pipe0") built from config."""
+    settings = config.HTTP_TRANSPORTS[name]
+    return Transport(
+        base_url=settings["base_url"],
+        pool_maxsize=settings.get("pool_maxsize", config.HTTP_POOL_MAXSIZE),
+        timeouts=settings.get("timeouts"),
+        gzip_min_bytes=settings.get("gzip_min_bytes", 0),
+    )
+
+
+def warm_all() -> None:
+    """Warm every configured transport (called on API startup)."""
+    for name in config.HTTP_TRANSPORTS:
+        get_transport(name).warm(config.HTTP_WARM_CONNECTIONS)
@@ -1,4 +1,5 @@
 import os
+from pathlib import Path
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -8,15 +9,39 @@ ATURIYA_BASE_URL = "https://api.aturiya.ai"
 ATURIYA_BEARER_TOKEN = os.getenv("ATURIYA_BEARER_TOKEN")
 ATURIYA_USER_ID = os.getenv("ATURIYA_USER_ID")
 ATURIYA_AGENT_ID = os.getenv("ATURIYA_AGENT_ID")
+ATURIYA_PAGE_SIZE = 50
+
+# Local mirror of Aturiya campaigns/leads used for delta ingest
+MIRROR_DB_PATH = os.getenv("MIRROR_DB_PATH", str(Path(__file__).parent / "data" / "mirror.db"))
+
+# Durable work queue for parallel workers on one host (see worker.py)
+QUEUE_DB_PATH = os.getenv("QUEUE_DB_PATH", str(Path(__file__).parent / "data" / "queue.db"))
+QUEUE_LEASE_SECONDS = 300  # must exceed the pipe0 sync read timeout
+QUEUE_MAX_ATTEMPTS = 3
 
 # pipe0 API
-PIPE0_BASE_URL = "https://api.pipe0.com"
+PIPE0_BASE_URL = os.getenv("PIPE0_BASE_URL", "https://api.pipe0.com")
 PIPE0_API_KEY = os.getenv("PIPE0_API_KEY")
 
+# pipe0 async-run webhooks (callback URL must reach POST /api/webhooks/pipe0)
+PIPE0_WEBHOOK_URL = os.getenv("PIPE0_WEBHOOK_URL")
+PIPE0_WEBHOOK_SECRET = os.getenv("PIPE0_WEBHOOK_SECRET")
+PIPE0_POLL_FALLBACK_INTERVAL = 30  # seconds between polls when webhooks are on
+
 # Enrichment settings
 PIPE0_BATCH_SIZE = 9  # sync endpoint limit is <10 records
 PIPE0_ENVIRONMENT = os.getenv("PIPE0_ENVIRONMENT", "production")
 
+# Dispatch lanes sharing the pipe0 budget (see clients/dispatch.py)
+PIPE0_MAX_CONCURRENCY = int(os.getenv("PIPE0_MAX_CONCURRENCY", "4"))  # concurrent pipe0 runs
+PIPE0_INTERACTIVE_RESERVED = 1  # slots bulk/backfill can never take
+PIPE0_LANE_WEIGHTS = {"interactive": 8, "bulk": 3, "backfill": 1}
+PIPE0_LANE_MAX_QUEUE = {"interactive": 32, "bulk": 256, "backfill": 1024}
+# Slot table shared by the API, main.py and workers (must be the same file for all)
+DISPATCH_DB_PATH = os.getenv("DISPATCH_DB_PATH", str(Path(__file__).parent / "data" / "dispatch.db"))
+DISPATCH_TICKET_TTL = 60  # seconds without a heartbeat before a slot is reclaimed
+DISPATCH_POLL_INTERVAL = 0.1  # seconds between checks while queued
+
 # Which enrichment pipes to run (toggle to control cost)
 ENRICHMENT_PIPES = {
     "company_overview": True,
@@ -25,3 +50,27 @@ ENRICHMENT_PIPES = {
     "news": True,
     "linkedin_posts": True,
 }
+
+# HTTP transport shared by the API clients (see clients/transport.py)
+HTTP_POOL_MAXSIZE = 16  # keep-alive connections per host
+HTTP_WARM_CONNECTIONS = 2  # connections opened per host on API startup
+HTTP_WARM_TIMEOUT = (2, 2)  # (connect, read) for warm-up requests; startup waits on them
+HTTP_TRANSPORTS = {
+    "aturiya": {
+        "base_url": ATURIYA_BASE_URL,
+        "timeouts": {  # (connect, read) seconds by path prefix
+            "default": (3.05, 15),
+        },
+    },
+    "pipe0": {
+        "base_url": PIPE0_BASE_URL,
+        "timeouts": {
+            "default": (3.05, 30),
+            "/v1/pipes/run/sync": (3.05, 120),  # sync runs block until enrichment finishes
+            "/v1/pipes/check/": (3.05, 10),
+        },
+        # Gzip JSON request bodies at least this large (0 disables). Off by
+        # default: pipe0 doesn't document accepting gzip-encoded requests
+        "gzip_min_bytes": int(os.getenv("PIPE0_GZIP_MIN_BYTES", "0")),
+    },
+}
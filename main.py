@@ -8,16 +8,25 @@ activity — producing outreach-ready lead objects for the SDR agent.
 Usage:
     python main.py                          # Enrich all leads from first campaign
     python main.py --campaign-id <id>       # Enrich leads from a specific campaign
+    python main.py --all-campaigns          # Enrich leads from every campaign (deduplicated)
+    python main.py --only-new               # Only enrich leads added/changed since the last run
+    python main.py --only-new --full-sync   # Same, but re-read every page to pick up edited/deleted leads
     python main.py --limit 5                # Only process first N leads
     python main.py --format json            # Output format: json (default), csv, both
+    python main.py --enqueue <job>          # Queue batches for worker.py instead of enriching here
+    python main.py --collect <job>          # Write output from a job's committed worker results
 """
 
 import argparse
 import logging
 import sys
 
+from models.lead import EnrichedLead
 from pipeline.ingest import fetch_leads
-from pipeline.enrich import enrich_leads
+from storage.mirror import LeadMirror
+from storage.queue import WorkQueue
+from pipeline.canonicalize import canonicalize_leads
+from pipeline.enrich import enrich_identities, without_enrichment
 from pipeline.output import save_json, save_csv, print_summary
 
 logging.basicConfig(
@@ -31,15 +40,56 @@ logger = logging.getLogger("pipeline")
 def main():
     parser = argparse.ArgumentParser(description="Lead Enrichment Pipeline")
     parser.add_argument("--campaign-id", help="Aturiya campaign ID (default: first campaign)")
+    parser.add_argument("--all-campaigns", action="store_true", help="Ingest leads from every campaign")
+    parser.add_argument("--only-new", action="store_true", help="Only enrich leads not enriched by a previous run")
+    parser.add_argument(
+        "--full-sync", action="store_true", help="With --only-new, re-download every page to pick up edited and deleted leads"
+    )
     parser.add_argument("--limit", type=int, help="Max leads to process")
     parser.add_argument("--format", choices=["json", "csv", "both"], default="both", help="Output format")
+    queue_mode = parser.add_mutually_exclusive_group()
+    queue_mode.add_argument("--enqueue", metavar="JOB", help="Queue lead batches for worker.py under JOB")
+    queue_mode.add_argument("--collect", metavar="JOB", help="Output the results workers committed for JOB")
     args = parser.parse_args()
 
+    mirror = LeadMirror()
+
+    if args.collect:
+        queue = WorkQueue()
+        counts = queue.counts(args.collect)
+        if counts["pending"] or counts["leased"]:
+            logger.warning("Job %s is not finished yet: %s", args.collect, counts)
+        enriched_leads = queue.results(args.collect)
+        if counts["failed"]:
+            # Same rows an in-process run gives for a failed batch: the leads, unenriched
+            failed = without_enrichment(queue.failed_identities(args.collect))
+            logger.warning(
+                "Job %s has %d failed batch(es); writing their %d leads without enrichment",
+                args.collect,
+                counts["failed"],
+                len(failed),
+            )
+            enriched_leads.extend(failed)
+        if not enriched_leads:
+            logger.error("No results for job %s. Exiting.", args.collect)
+            sys.exit(1)
+        write_output(enriched_leads, args.format, mirror)
+        return
+
     # Stage 1: Ingest
     logger.info("=== STAGE 1: INGEST ===")
-    raw_leads = fetch_leads(campaign_id=args.campaign_id)
+    raw_leads = fetch_leads(
+        campaign_id=args.campaign_id,
+        all_campaigns=args.all_campaigns,
+        only_new=args.only_new,
+        mirror=mirror,
+        full_sync=args.full_sync,
+    )
 
     if not raw_leads:
+        if args.only_new:
+            logger.info("No new leads since the last run. Nothing to do.")
+            return
         logger.error("No leads found. Exiting.")
         sys.exit(1)
 
@@ -47,17 +97,32 @@ def main():
         raw_leads = raw_leads[: args.limit]
         logger.info("Limited to %d leads", args.limit)
 
-    # Stage 2: Enrich
-    logger.info("=== STAGE 2: ENRICH ===")
-    enriched_leads = enrich_leads(raw_leads)
+    # Stage 2: Canonicalize
+    logger.info("=== STAGE 2: CANONICALIZE ===")
+    identities = canonicalize_leads(raw_leads)
+
+    if args.enqueue:
+        WorkQueue().enqueue(args.enqueue, identities)
+        logger.info("Start workers with: python worker.py --job %s", args.enqueue)
+        return
+
+    # Stage 3: Enrich
+    logger.info("=== STAGE 3: ENRICH ===")
+    enriched_leads = enrich_identities(identities)
+
+    write_output(enriched_leads, args.format, mirror)
+
 
-    # Stage 3: Output
-    logger.info("=== STAGE 3: OUTPUT ===")
-    if args.format in ("json", "both"):
+def write_output(enriched_leads: list[EnrichedLead], fmt: str, mirror: LeadMirror) -> None:
+    """Stage 4: write files, record what was enriched and print the summary."""
+    logger.info("=== STAGE 4: OUTPUT ===")
+    if fmt in ("json", "both"):
         save_json(enriched_leads)
-    if args.format in ("csv", "both"):
+    if fmt in ("csv", "both"):
         save_csv(enriched_leads)
 
+    # Failed batches have no run id; leave them for the next --only-new run
+    mirror.mark_enriched([l.lead_id for l in enriched_leads if l.enrichment_metadata.pipe0_run_id])
     print_summary(enriched_leads)
 
     logger.info("Pipeline complete.")
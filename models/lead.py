@@ -24,6 +24,13 @@ class RawLead(BaseModel):
     created_at: Optional[str] = None
 
 
+class LeadIdentity(BaseModel):
+    """A canonical person shared by one or more RawLeads across campaigns."""
+    key: str
+    lead: RawLead  # canonical representative sent to pipe0
+    members: list[RawLead] = Field(default_factory=list)
+
+
 class CompanyOverview(BaseModel):
     description: Optional[str] = None
     industry: Optional[str] = None
@@ -0,0 +1,210 @@
+"""Declarative registry of pipe0 enrichment signals.
+
+Each `Signal` says which pipe produces it, which pipe0 output fields it
+reads, where they land on `EnrichedLead` and how they appear in the CSV
+export. `merge_signals` and `flatten_signals` are generated from the
+registry as straight-line code once at import time (inspect the result via
+their `__source__`) and reused for every batch, so adding a pipe (e.g. job
+postings) is one new `Signal` entry plus its `EnrichedLead` field.
+"""
+
+import json
+from typing import Any, Callable, Optional
+from pydantic import BaseModel, Field
+from models.lead import CompanyOverview, FundingInfo
+
+
+class Signal(BaseModel):
+    """One pipe0 enrichment signal and how it maps onto EnrichedLead."""
+    name: str  # key in config.ENRICHMENT_PIPES
+    pipe_id: str
+    target: str  # EnrichedLead attribute the signal fills
+    # pipe0 output field -> attribute on `model` (None when target isn't a model)
+    fields: dict[str, Optional[str]]
+    model: Optional[type[BaseModel]] = None
+    # Whether this signal's fields alone are enough to create the target model
+    creates: bool = True
+    # Builds the target value from the parsed enrichment (value targets only)
+    transform: Optional[Callable[[dict], Any]] = None
+    # CSV columns: (column, attribute on the target or None for the target itself, formatter)
+    csv: list[tuple[str, Optional[str], Optional[Callable[[Any], Any]]]] = Field(default_factory=list)
+
+
+def _linkedin_posts(enrichment: dict) -> list[str] | None:
+    post_data = enrichment.get("crustdata_post_list")
+    if post_data and isinstance(post_data, list):
+        # Extract post text from crustdata format, 5 most recent
+        return [
+            post.get("text", str(post)) if isinstance(post, dict) else str(post)
+            for post in post_data[:5]
+        ]
+    if enrichment.get("post_list_string"):
+        return [enrichment["post_list_string"]]
+    return None
+
+
+SIGNALS: list[Signal] = [
+    Signal(
+        name="company_overview",
+        pipe_id="company:overview@2",
+        target="company_overview",
+        model=CompanyOverview,
+        fields={
+            "company_description": "description",
+            "company_industry": "industry",
+            "headcount": "headcount",
+            "founded_year": "founded_year",
+            "company_region": "region",
+            "estimated_revenue": "estimated_revenue",
+        },
+        csv=[
+            ("company_description", "description", None),
+            ("company_industry", "industry", None),
+            ("company_headcount", "headcount", None),
+            ("company_founded_year", "founded_year", None),
+            ("company_region", "region", None),
+            ("company_estimated_revenue", "estimated_revenue", None),
+        ],
+    ),
+    Signal(
+        name="tech_stack",
+        pipe_id="company:techstack:builtwith@1",
+        target="tech_stack",
+        fields={"technology_list": None},
+        csv=[("tech_stack", None, lambda techs: ", ".join(str(t) for t in techs))],
+    ),
+    Signal(
+        name="funding",
+        pipe_id="company:funding:leadmagic@1",
+        target="funding",
+        model=FundingInfo,
+        fields={
+            "funding_total_usd": "total_funding_usd",
+            "funding_history": "funding_history",
+        },
+        csv=[
+            ("total_funding_usd", "total_funding_usd", None),
+            ("funding_history", "funding_history", lambda h: json.dumps(h, default=str) if h else None),
+        ],
+    ),
+    Signal(
+        name="news",
+        pipe_id="company:newssummary:website@1",
+        target="funding",
+        model=FundingInfo,
+        fields={"company_news_summary": "news_summary"},
+        # News is attached to funding info, but doesn't create it on its own
+        creates=False,
+        csv=[("company_news_summary", "news_summary", None)],
+    ),
+    Signal(
+        name="linkedin_posts",
+        pipe_id="people:posts:crustdata@1",
+        target="linkedin_posts",
+        fields={"crustdata_post_list": None, "post_list_string": None},
+        transform=_linkedin_posts,
+        csv=[("linkedin_posts", None, lambda posts: " | ".join(posts[:3]))],
+    ),
+]
+
+PIPES = {signal.name: signal.pipe_id for signal in SIGNALS}
+
+
+def _compile(name: str, lines: list[str], namespace: dict) -> Callable:
+    """Build a function from generated source (as dataclasses does)."""
+    source = "\n".join(lines)
+    exec(compile(source, f"<signals:{name}>", "exec"), namespace)
+    fn = namespace[name]
+    fn.__source__ = source
+    return fn
+
+
+def _compile_merge() -> Callable[[dict], dict]:
+    """Generate `merge_signals`: one straight-line expression per EnrichedLead target."""
+    # Group signals by target, in registry order (news shares funding's model)
+    targets: dict[str, list[Signal]] = {}
+    for signal in SIGNALS:
+        targets.setdefault(signal.target, []).append(signal)
+
+    namespace: dict[str, Any] = {}
+    lines = ["def merge_signals(enrichment):", "    get = enrichment.get", "    return {"]
+    for target, signals in targets.items():
+        assert target.isidentifier() and all(
+            attr is None or attr.isidentifier() for signal in signals for attr in signal.fields.values()
+        ), target
+        model = signals[0].model
+        if model is not None:
+            namespace[f"_model_{target}"] = model
+            kwargs = ", ".join(
+                f"{attr}=get({field!r})"
+                for signal in signals
+                for field, attr in signal.fields.items()
+            )
+            triggers = " or ".join(
+                f"{field!r} in enrichment"
+                for signal in signals
+                if signal.creates
+                for field in signal.fields
+            )
+            lines.append(f"        {target!r}: _model_{target}({kwargs}) if {triggers} else None,")
+        elif signals[0].transform is not None:
+            namespace[f"_transform_{target}"] = signals[0].transform
+            lines.append(f"        {target!r}: _transform_{target}(enrichment),")
+        else:
+            (field,) = signals[0].fields
+            lines.append(f"        {target!r}: get({field!r}),")
+    lines.append("    }")
+
+    merge_signals = _compile("merge_signals", lines, namespace)
+    merge_signals.__doc__ = "Map a parsed enrichment onto EnrichedLead signal attributes."
+    return merge_signals
+
+
+def _compile_flatten() -> Callable[[Any], dict]:
+    """Generate `flatten_signals`: CSV columns for each non-empty signal."""
+    namespace: dict[str, Any] = {}
+    lines = ["def flatten_signals(lead):", "    row = {}"]
+    for i, signal in enumerate(SIGNALS):
+        if not signal.csv:
+            continue
+        assert signal.target.isidentifier(), signal.target
+        lines += [f"    value = lead.{signal.target}", "    if value:"]
+        for j, (column, attr, fmt) in enumerate(signal.csv):
+            assert attr is None or attr.isidentifier(), attr
+            cell = f"value.{attr}" if attr else "value"
+            if fmt is not None:
+                namespace[f"_fmt_{i}_{j}"] = fmt
+                cell = f"_fmt_{i}_{j}({cell})"
+            lines.append(f"        row[{column!r}] = {cell}")
+    lines.append("    return row")
+
+    flatten_signals = _compile("flatten_signals", lines, namespace)
+    flatten_signals.__doc__ = "CSV columns for an EnrichedLead's signals (omitted when a signal is empty)."
+    return flatten_signals
+
+
+def parse_fields(fields: dict) -> tuple[dict, list[str], list[str]]:
+    """Split a pipe0 record's fields into (values, found, missed), skipping input echoes.
+
+    Unlike merge/flatten this isn't generated from the registry: it keeps
+    every field pipe0 returns, so `signals_found`/`signals_missed` also
+    report outputs no `Signal` maps yet.
+    """
+    enriched = {}
+    found = []
+    missed = []
+    for field_name, field_data in fields.items():
+        resolved_by = field_data.get("resolved_by")
+        if resolved_by and resolved_by.get("ref") == "input":
+            continue
+        value = field_data.get("value")
+        if value is not None and field_data.get("status") == "completed":
+            enriched[field_name] = value
+            found.append(field_name)
+        else:
+            missed.append(field_name)
+    return enriched, found, missed
+
+
+merge_signals = _compile_merge()
+flatten_signals = _compile_flatten()
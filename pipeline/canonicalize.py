@@ -0,0 +1,112 @@
+import logging
+from models.lead import RawLead, LeadIdentity
+from utils.identity import (
+    _hash,
+    company_domain,
+    identity_keys,
+    normalize_email,
+    normalize_linkedin_url,
+    normalize_name,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _find(parent: list[int], i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def _canonical_lead(members: list[RawLead]) -> RawLead:
+    """Build the representative lead for a group, filling gaps from duplicates."""
+    first = members[0]
+    update = {}
+    for field in ("linkedin_url", "email", "website", "organization"):
+        value = next((getattr(m, field) for m in members if getattr(m, field)), None)
+        update[field] = value
+    update["linkedin_url"] = normalize_linkedin_url(update["linkedin_url"])
+    update["email"] = normalize_email(update["email"])
+    return first.model_copy(update=update)
+
+
+def _compatible(kind: str, a: dict, b: dict) -> bool:
+    """Whether two groups may merge on a shared key of `kind`.
+
+    A shared LinkedIn URL always means the same person. A shared email
+    only does if the groups don't carry different LinkedIn URLs or
+    different names — role addresses like sales@ are shared by many people.
+    """
+    if kind == "li":
+        return True
+    if a["linkedin"] and b["linkedin"] and a["linkedin"].isdisjoint(b["linkedin"]):
+        return False
+    if a["names"] and b["names"] and a["names"].isdisjoint(b["names"]):
+        return False
+    return True
+
+
+def canonicalize_leads(raw_leads: list[RawLead]) -> list[LeadIdentity]:
+    """Stage 2: Collapse duplicate leads into canonical identities.
+
+    Leads that share a normalized LinkedIn URL are the same person, even
+    across campaigns. Leads that share an email are merged too, unless
+    their LinkedIn URLs disagree or their names differ. Name + company
+    domain is only used for leads with neither identifier. Each identity is
+    enriched once and the result fanned out to every member. Identities are
+    returned in order of their first appearance.
+    """
+    parent = list(range(len(raw_leads)))
+    groups_info: list[dict] = []
+    # key -> roots of every group holding it (several when a merge was refused)
+    roots_by_key: dict[str, list[int]] = {}
+    primary_keys: list[str] = []
+
+    for i, lead in enumerate(raw_leads):
+        domain = company_domain(lead.email, lead.website)
+        keys = identity_keys(lead.linkedin_url, lead.email, lead.name, domain)
+        linkedin = normalize_linkedin_url(lead.linkedin_url)
+        groups_info.append({
+            "linkedin": {linkedin} if linkedin else set(),
+            "names": {normalize_name(lead.name)} - {""},
+        })
+        # Leads with nothing to key on are only ever their own identity
+        primary_keys.append(next(iter(keys.values()), f"lead:{lead.lead_id}"))
+
+        for kind, key in keys.items():
+            holders = roots_by_key.setdefault(key, [])
+            for j in holders:
+                ri, rj = _find(parent, i), _find(parent, j)
+                if ri == rj or not _compatible(kind, groups_info[ri], groups_info[rj]):
+                    continue
+                root, child = min(ri, rj), max(ri, rj)
+                parent[child] = root
+                groups_info[root]["linkedin"] |= groups_info[child]["linkedin"]
+                groups_info[root]["names"] |= groups_info[child]["names"]
+            holders.append(i)
+            roots_by_key[key] = list(dict.fromkeys(_find(parent, j) for j in holders))
+
+    groups: dict[int, list[RawLead]] = {}
+    for i, lead in enumerate(raw_leads):
+        groups.setdefault(_find(parent, i), []).append(lead)
+
+    identities = []
+    used_keys = set()
+    for root, members in groups.items():
+        key = primary_keys[root]
+        if key in used_keys:
+            # Same email as another identity but not merged (e.g. a role address)
+            key = _hash(f"{key}:{members[0].lead_id}")
+        used_keys.add(key)
+        identities.append(
+            LeadIdentity(key=key, lead=_canonical_lead(members), members=members)
+        )
+
+    logger.info(
+        "Canonicalized %d leads into %d identities (%d duplicates)",
+        len(raw_leads),
+        len(identities),
+        len(raw_leads) - len(identities),
+    )
+    return identities
@@ -1,12 +1,14 @@
 import logging
 from models.lead import (
     RawLead,
+    LeadIdentity,
     EnrichedLead,
-    CompanyOverview,
-    FundingInfo,
     EnrichmentMetadata,
 )
+from models.signals import merge_signals
 from clients.pipe0 import Pipe0Client
+from clients.dispatch import BULK, INTERACTIVE, DispatchRejected, get_lane_client
+from pipeline.canonicalize import canonicalize_leads
 import config
 
 logger = logging.getLogger(__name__)
@@ -21,53 +23,8 @@ def _batch(items: list, size: int):
 def _merge_lead(raw: RawLead, enrichment: dict) -> EnrichedLead:
     """Merge raw Apollo data with pipe0 enrichment into an EnrichedLead."""
 
-    # Company overview
-    company_overview = None
-    if any(
-        k in enrichment
-        for k in (
-            "company_description",
-            "company_industry",
-            "headcount",
-            "founded_year",
-            "company_region",
-            "estimated_revenue",
-        )
-    ):
-        company_overview = CompanyOverview(
-            description=enrichment.get("company_description"),
-            industry=enrichment.get("company_industry"),
-            headcount=enrichment.get("headcount"),
-            founded_year=enrichment.get("founded_year"),
-            region=enrichment.get("company_region"),
-            estimated_revenue=enrichment.get("estimated_revenue"),
-        )
-
-    # Tech stack
-    tech_stack = enrichment.get("technology_list")
-
-    # Funding
-    funding = None
-    if "funding_history" in enrichment or "funding_total_usd" in enrichment:
-        funding = FundingInfo(
-            total_funding_usd=enrichment.get("funding_total_usd"),
-            funding_history=enrichment.get("funding_history"),
-            news_summary=enrichment.get("company_news_summary"),
-        )
-
-    # LinkedIn posts
-    linkedin_posts = None
-    post_data = enrichment.get("crustdata_post_list")
-    if post_data and isinstance(post_data, list):
-        # Extract post text from crustdata format
-        linkedin_posts = []
-        for post in post_data[:5]:  # Limit to 5 most recent
-            if isinstance(post, dict):
-                linkedin_posts.append(post.get("text", str(post)))
-            else:
-                linkedin_posts.append(str(post))
-    elif enrichment.get("post_list_string"):
-        linkedin_posts = [enrichment["post_list_string"]]
+    # Signal attributes (company overview, tech stack, funding, posts, ...)
+    signals = merge_signals(enrichment)
 
     # Metadata
     metadata = EnrichmentMetadata(
@@ -86,23 +43,35 @@ def _merge_lead(raw: RawLead, enrichment: dict) -> EnrichedLead:
         linkedin_url=raw.linkedin_url,
         campaign_id=raw.campaign_id,
         campaign_name=raw.campaign_name,
-        company_overview=company_overview,
-        tech_stack=tech_stack,
-        funding=funding,
-        linkedin_posts=linkedin_posts,
         enrichment_metadata=metadata,
+        **signals,
     )
 
 
-def enrich_one(raw: RawLead, client: Pipe0Client | None = None) -> EnrichedLead:
-    """Enrich a single lead via pipe0 and return an EnrichedLead."""
-    client = client or Pipe0Client()
+def enrich_one(
+    raw: RawLead,
+    client: Pipe0Client | None = None,
+    use_async: bool = False,
+) -> EnrichedLead:
+    """Enrich a single lead via pipe0 and return an EnrichedLead.
+
+    With use_async=True the lead goes through an async run, which resolves
+    via the pipe0 webhook when one is configured (polling otherwise).
+    Raises DispatchRejected if the dispatch lane is saturated.
+    """
+    client = client or get_lane_client(INTERACTIVE)
     index_map = {1: raw.lead_id}
     batch_dicts = [raw.model_dump()]
 
     try:
-        response = client.enrich_sync(batch_dicts)
+        if use_async:
+            run_id = client.enrich_async(batch_dicts)
+            response = client.wait_for_run(run_id) if run_id else {}
+        else:
+            response = client.enrich_sync(batch_dicts)
         enrichments = Pipe0Client.parse_enrichment(response, index_map)
+    except DispatchRejected:
+        raise
     except Exception as e:
         logger.error("Enrichment failed for %s: %s", raw.name, e)
         enrichments = {}
@@ -111,48 +80,89 @@ def enrich_one(raw: RawLead, client: Pipe0Client | None = None) -> EnrichedLead:
     return _merge_lead(raw, enrichment)
 
 
-def enrich_leads(raw_leads: list[RawLead]) -> list[EnrichedLead]:
-    """Stage 2: Enrich leads via pipe0 in batches.
+def _fetch_enrichments(batch: list[LeadIdentity], client: Pipe0Client) -> dict[str, dict]:
+    """Run one pipe0 sync call for a batch; returns {identity_key: enrichment}."""
+    # Build index map: pipe0 1-based id -> identity key
+    index_map = {i + 1: identity.key for i, identity in enumerate(batch)}
 
-    Processes leads in batches of PIPE0_BATCH_SIZE (default 9) using
-    the synchronous endpoint, with graceful fallback on errors.
-    """
-    client = Pipe0Client()
+    # Convert to dicts for pipe0 input
+    batch_dicts = [identity.lead.model_dump() for identity in batch]
+
+    response = client.enrich_sync(batch_dicts)
+    return Pipe0Client.parse_enrichment(response, index_map)
+
+
+def _fan_out(batch: list[LeadIdentity], enrichments: dict[str, dict]) -> list[EnrichedLead]:
+    """Merge each identity's enrichment into every one of its member leads."""
     enriched_leads = []
-    batch_size = config.PIPE0_BATCH_SIZE
-    total_batches = (len(raw_leads) + batch_size - 1) // batch_size
+    for identity in batch:
+        enrichment = enrichments.get(identity.key, {})
+        for lead in identity.members:
+            enriched_leads.append(_merge_lead(lead, enrichment))
+
+        found = len(enrichment.get("_signals_found", []))
+        missed = len(enrichment.get("_signals_missed", []))
+        logger.debug(
+            "  %s @ %s (%d leads) — %d signals found, %d missed",
+            identity.lead.name,
+            identity.lead.organization,
+            len(identity.members),
+            found,
+            missed,
+        )
+    return enriched_leads
+
+
+def without_enrichment(identities: list[LeadIdentity]) -> list[EnrichedLead]:
+    """Member leads of `identities` with no signals, as a failed batch yields."""
+    return _fan_out(identities, {})
+
+
+def enrich_batch(batch: list[LeadIdentity], client: Pipe0Client | None = None) -> list[EnrichedLead]:
+    """Enrich one batch (<= PIPE0_BATCH_SIZE identities); pipe0 errors propagate.
+
+    Used by queue workers, which retry failed batches instead of
+    degrading them.
+    """
+    client = client or get_lane_client(BULK)
+    return _fan_out(batch, _fetch_enrichments(batch, client))
 
-    for batch_num, batch in enumerate(_batch(raw_leads, batch_size), start=1):
-        logger.info("Enriching batch %d/%d (%d leads)", batch_num, total_batches, len(batch))
 
-        # Build index map: pipe0 1-based id -> lead_id
-        index_map = {i + 1: lead.lead_id for i, lead in enumerate(batch)}
+def enrich_identities(
+    identities: list[LeadIdentity],
+    client: Pipe0Client | None = None,
+) -> list[EnrichedLead]:
+    """Stage 2: Enrich canonical identities via pipe0 in batches.
 
-        # Convert to dicts for pipe0 input
-        batch_dicts = [lead.model_dump() for lead in batch]
+    Processes identities in batches of PIPE0_BATCH_SIZE (default 9) using
+    the synchronous endpoint, with graceful fallback on errors. Each
+    identity is sent to pipe0 once and its enrichment is merged into every
+    member lead, so the output has one EnrichedLead per input RawLead.
+    Runs go through the shared bulk dispatch lane unless a client is given.
+    """
+    client = client or get_lane_client(BULK)
+    enriched_leads = []
+    batch_size = config.PIPE0_BATCH_SIZE
+    total_batches = (len(identities) + batch_size - 1) // batch_size
+
+    for batch_num, batch in enumerate(_batch(identities, batch_size), start=1):
+        logger.info("Enriching batch %d/%d (%d identities)", batch_num, total_batches, len(batch))
 
         try:
-            response = client.enrich_sync(batch_dicts)
-            enrichments = Pipe0Client.parse_enrichment(response, index_map)
+            enrichments = _fetch_enrichments(batch, client)
         except Exception as e:
             logger.error("Batch %d failed: %s. Returning leads without enrichment.", batch_num, e)
             enrichments = {}
 
-        # Merge each lead
-        for lead in batch:
-            enrichment = enrichments.get(lead.lead_id, {})
-            enriched = _merge_lead(lead, enrichment)
-            enriched_leads.append(enriched)
-
-            found = len(enrichment.get("_signals_found", []))
-            missed = len(enrichment.get("_signals_missed", []))
-            logger.debug(
-                "  %s @ %s — %d signals found, %d missed",
-                lead.name,
-                lead.organization,
-                found,
-                missed,
-            )
+        enriched_leads.extend(_fan_out(batch, enrichments))
 
     logger.info("Enrichment complete: %d leads processed", len(enriched_leads))
     return enriched_leads
+
+
+def enrich_leads(
+    raw_leads: list[RawLead],
+    client: Pipe0Client | None = None,
+) -> list[EnrichedLead]:
+    """Canonicalize then enrich raw leads; see `enrich_identities`."""
+    return enrich_identities(canonicalize_leads(raw_leads), client=client)
@@ -1,31 +1,158 @@
 import logging
 from clients.aturiya import AturiyaClient
 from models.lead import RawLead
+from storage.mirror import LeadMirror, Watermark
+import config
 
 logger = logging.getLogger(__name__)
 
 
-def fetch_leads(campaign_id: str | None = None) -> list[RawLead]:
+def _page_order(leads: list[RawLead]) -> str | None:
+    """Infer whether a page is sorted newest-first ("desc") or oldest-first ("asc")."""
+    stamps = [lead.created_at for lead in leads if lead.created_at]
+    if len(stamps) < 2 or stamps[0] == stamps[-1]:
+        return None
+    return "desc" if stamps[0] > stamps[-1] else "asc"
+
+
+def _fetch_delta(client: AturiyaClient, campaign_id: str, watermark: Watermark) -> list[RawLead]:
+    """Fetch only the pages of a campaign that can hold leads newer than `watermark`.
+
+    Aturiya doesn't expose a `since` filter, so the sort order is inferred
+    from the first page: newest-first campaigns are read until a page
+    reaches the watermark, oldest-first campaigns skip straight to the page
+    holding the last mirrored lead. If the order can't be told, every page
+    is read.
+    """
+    per_page = config.ATURIYA_PAGE_SIZE
+    leads, pagination = client.get_leads(campaign_id, page=1, per_page=per_page)
+    fetched = list(leads)
+    pages_read = 1
+    order = _page_order(leads)
+
+    if order == "asc":
+        # Step back one page in case leads were removed since the last sync
+        page = max(2, watermark.lead_count // per_page)
+        more = page <= pagination.get("total_pages", 1)
+    else:
+        page = 2
+        more = pagination.get("has_next_page", False)
+        if order == "desc" and any(watermark.is_behind(lead) for lead in leads):
+            more = False
+
+    while more:
+        leads, pagination = client.get_leads(campaign_id, page=page, per_page=per_page)
+        fetched.extend(leads)
+        pages_read += 1
+        page += 1
+        more = pagination.get("has_next_page", False)
+        if order == "desc" and any(watermark.is_behind(lead) for lead in leads):
+            more = False
+
+    logger.info(
+        "Delta fetch for campaign %s: %d leads from %d/%d page(s) (order: %s)",
+        campaign_id,
+        len(fetched),
+        pages_read,
+        pagination.get("total_pages", 1),
+        order or "unknown",
+    )
+    return fetched
+
+
+def sync_campaign(
+    client: AturiyaClient,
+    mirror: LeadMirror,
+    campaign_id: str,
+    full: bool = False,
+) -> list[RawLead]:
+    """Bring the local mirror of one campaign up to date.
+
+    The first sync downloads every page; later syncs only fetch pages past
+    the campaign's `created_at` watermark, so they detect new leads but not
+    edits to (or deletions of) leads that were already mirrored. With
+    full=True every page is downloaded and upserted, and mirrored leads
+    that no longer exist upstream are removed. Returns the leads fetched
+    from Aturiya, in API order (the whole campaign when full).
+    """
+    watermark = mirror.get_watermark(campaign_id)
+    if watermark is None or full:
+        leads = client.get_all_leads(campaign_id)
+    else:
+        leads = _fetch_delta(client, campaign_id, watermark)
+
+    delta = mirror.upsert_leads(leads)
+    removed = 0
+    if full:
+        removed = mirror.delete_missing(campaign_id, {lead.lead_id for lead in leads})
+    watermark = mirror.advance_watermark(campaign_id)
+    logger.info(
+        "Synced campaign %s%s: %d new/changed leads, %d removed, %d mirrored (watermark %s)",
+        campaign_id,
+        " (full)" if full else "",
+        len(delta),
+        removed,
+        watermark.lead_count,
+        watermark.created_at,
+    )
+    return leads
+
+
+def fetch_leads(
+    campaign_id: str | None = None,
+    all_campaigns: bool = False,
+    only_new: bool = False,
+    mirror: LeadMirror | None = None,
+    full_sync: bool = False,
+) -> list[RawLead]:
     """Stage 1: Ingest leads from Aturiya API.
 
     If no campaign_id is provided, picks the first available campaign.
+    With all_campaigns=True, leads from every campaign are concatenated
+    (the canonicalization stage later collapses cross-campaign duplicates).
+
+    Without only_new, every page is downloaded and the campaign's leads are
+    returned exactly as Aturiya lists them (the mirror is refreshed along
+    the way). With only_new=True, the mirror is delta-synced, so only pages
+    that can hold new leads are downloaded, and the mirrored leads that
+    haven't been enriched yet are returned, oldest first. The delta sync
+    misses edited or deleted leads; full_sync=True re-reads every page.
     """
     client = AturiyaClient()
+    mirror = mirror or LeadMirror()
 
     # Verify auth
     user_info = client.verify_auth()
     logger.info("Authenticated as %s (%s)", user_info.get("full_name"), user_info.get("email"))
 
-    # Get campaign
-    if not campaign_id:
+    campaigns = []
+    if all_campaigns or not campaign_id:
         campaigns = client.list_campaigns()
-        if not campaigns:
-            raise RuntimeError("No campaigns found. Create a campaign in Aturiya first.")
-        campaign_id = campaigns[0]["id"]
-        logger.info("Using campaign: %s (%s)", campaigns[0].get("name"), campaign_id)
+        mirror.upsert_campaigns(campaigns)
+
+    if all_campaigns:
+        campaign_ids = [campaign["id"] for campaign in campaigns]
+    else:
+        # Get campaign
+        if not campaign_id:
+            if not campaigns:
+                raise RuntimeError("No campaigns found. Create a campaign in Aturiya first.")
+            campaign_id = campaigns[0]["id"]
+            logger.info("Using campaign: %s (%s)", campaigns[0].get("name"), campaign_id)
+        campaign_ids = [campaign_id]
 
-    # Fetch all leads
-    leads = client.get_all_leads(campaign_id)
-    logger.info("Ingested %d raw leads from campaign %s", len(leads), campaign_id)
+    leads = []
+    for cid in campaign_ids:
+        if only_new:
+            sync_campaign(client, mirror, cid, full=full_sync)
+            leads.extend(mirror.unenriched_leads(cid))
+        else:
+            leads.extend(sync_campaign(client, mirror, cid, full=True))
 
+    logger.info(
+        "Ingested %d %sleads from %d campaign(s)",
+        len(leads),
+        "new " if only_new else "",
+        len(campaign_ids),
+    )
     return leads
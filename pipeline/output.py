@@ -3,6 +3,7 @@ import csv
 import logging
 from pathlib import Path
 from models.lead import EnrichedLead
+from models.signals import flatten_signals
 
 logger = logging.getLogger(__name__)
 
@@ -38,28 +39,8 @@ def save_csv(leads: list[EnrichedLead], filename: str = "enriched_leads.csv") ->
             "campaign_name": lead.campaign_name,
         }
 
-        # Flatten company overview
-        if lead.company_overview:
-            row["company_description"] = lead.company_overview.description
-            row["company_industry"] = lead.company_overview.industry
-            row["company_headcount"] = lead.company_overview.headcount
-            row["company_founded_year"] = lead.company_overview.founded_year
-            row["company_region"] = lead.company_overview.region
-            row["company_estimated_revenue"] = lead.company_overview.estimated_revenue
-
-        # Tech stack as comma-separated
-        if lead.tech_stack:
-            row["tech_stack"] = ", ".join(str(t) for t in lead.tech_stack)
-
-        # Funding
-        if lead.funding:
-            row["total_funding_usd"] = lead.funding.total_funding_usd
-            row["funding_history"] = json.dumps(lead.funding.funding_history, default=str) if lead.funding.funding_history else None
-            row["company_news_summary"] = lead.funding.news_summary
-
-        # LinkedIn posts
-        if lead.linkedin_posts:
-            row["linkedin_posts"] = " | ".join(lead.linkedin_posts[:3])
+        # Signal columns (company overview, tech stack, funding, posts, ...)
+        row.update(flatten_signals(lead))
 
         # Metadata
         row["signals_found"] = ", ".join(lead.enrichment_metadata.signals_found)
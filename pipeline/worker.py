@@ -0,0 +1,84 @@
+import logging
+import threading
+import time
+from pathlib import Path
+from clients.dispatch import BULK, get_lane_client
+from pipeline.enrich import enrich_batch
+from storage.queue import Lease, WorkQueue, default_worker_id
+import config
+
+logger = logging.getLogger(__name__)
+
+
+def _keep_alive(queue_path: Path, lease: Lease, stop: threading.Event) -> None:
+    """Renew `lease` every third of the lease period until `stop` is set."""
+    # SQLite connections can't be shared across threads; use our own
+    queue = WorkQueue(queue_path)
+    try:
+        while not stop.wait(config.QUEUE_LEASE_SECONDS / 3):
+            if not queue.renew(lease):
+                logger.warning("Lease on batch %d lost during enrichment", lease.batch_id)
+                return
+    finally:
+        queue.close()
+
+
+def run_worker(
+    queue: WorkQueue,
+    job: str | None = None,
+    lane: str = BULK,
+    owner: str | None = None,
+    follow: bool = False,
+    poll_interval: float = 5,
+) -> int:
+    """Claim and enrich queued batches until the queue is drained.
+
+    The lease is renewed right before the pipe0 call (the batch is skipped
+    if it was already lost) and from a heartbeat thread while the call,
+    including any wait for a dispatch slot, is in progress. A batch that
+    raises is released for another attempt (or marked failed after
+    QUEUE_MAX_ATTEMPTS). While other workers still hold leases, this
+    worker waits in case one expires and needs reclaiming; with follow=True
+    it never exits. Returns the number of batches this worker committed.
+    """
+    owner = owner or default_worker_id()
+    client = get_lane_client(lane)
+    committed = 0
+    logger.info("Worker %s started (job: %s, lane: %s)", owner, job or "any", lane)
+
+    while True:
+        lease = queue.claim(owner, job=job)
+        if lease is None:
+            counts = queue.counts(job)
+            if not follow and counts["pending"] == 0 and counts["leased"] == 0:
+                break
+            time.sleep(poll_interval)
+            continue
+
+        logger.info(
+            "Claimed batch %d (%d identities, attempt %d)",
+            lease.batch_id,
+            len(lease.identities),
+            lease.attempts,
+        )
+        if not queue.renew(lease):
+            logger.warning("Lease on batch %d lost before enrichment; skipping", lease.batch_id)
+            continue
+
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=_keep_alive, args=(queue.path, lease, stop), daemon=True)
+        heartbeat.start()
+        try:
+            leads = enrich_batch(lease.identities, client=client)
+        except Exception as e:
+            queue.fail(lease, str(e))
+            continue
+        finally:
+            stop.set()
+            heartbeat.join()
+
+        if queue.complete(lease, leads):
+            committed += 1
+
+    logger.info("Worker %s finished: %d batches committed", owner, committed)
+    return committed
@@ -0,0 +1,164 @@
+"""
+Local pipe0 stand-in
+====================
+A tiny fake of the pipe0 API for exercising the webhook path without
+spending credits. Async runs "complete" after a delay and are reported to
+the run's `config.webhook_url` with a signed callback, exactly like the
+real service; `/v1/pipes/check/{run_id}` keeps working as the fallback.
+
+Usage:
+    export PIPE0_WEBHOOK_SECRET=dev-secret
+    python scripts/pipe0_standin.py --port 8100 --delay 1
+
+    # in another shell
+    export PIPE0_BASE_URL=http://localhost:8100
+    export PIPE0_WEBHOOK_URL=http://localhost:8000/api/webhooks/pipe0
+    export PIPE0_WEBHOOK_SECRET=dev-secret
+    uvicorn api.app:app
+    curl -X POST 'localhost:8000/api/leads/1/enrich?use_async=true' \\
+         -H 'Content-Type: application/json' \\
+         -d '{"lead_id": "1", "agent_id": "a", "campaign_id": "c", "name": "Jane"}'
+
+    # or post a single signed callback by hand
+    python scripts/pipe0_standin.py --send <run_id> --to http://localhost:8000/api/webhooks/pipe0
+"""
+
+import argparse
+import gzip
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+import urllib.request
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_runs: dict[str, dict] = {}
+_lock = threading.Lock()
+
+
+def _fake_records(inputs: list[dict]) -> dict:
+    records = {}
+    for entry in inputs:
+        rec_id = entry.get("id", len(records) + 1)
+        company = entry.get("company_name") or entry.get("company_website_url") or "Unknown"
+        records[str(rec_id)] = {
+            "id": rec_id,
+            "fields": {
+                "company_description": {"status": "completed", "value": f"{company} builds things."},
+                "company_industry": {"status": "completed", "value": "Software"},
+                "technology_list": {"status": "completed", "value": ["Python", "React"]},
+                "funding_total_usd": {"status": "no_result", "value": None},
+            },
+        }
+    return records
+
+
+def _sign(body: bytes, secret: str) -> str:
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def post_callback(url: str, payload: dict, secret: str) -> int:
+    """POST a signed completion callback, returning the HTTP status."""
+    body = json.dumps(payload).encode()
+    req = urllib.request.Request(
+        url,
+        data=body,
+        headers={"Content-Type": "application/json", "X-Pipe0-Signature": _sign(body, secret)},
+        method="POST",
+    )
+    with urllib.request.urlopen(req, timeout=10) as resp:
+        return resp.status
+
+
+def _complete_later(run_id: str, webhook_url: str | None, delay: float, secret: str) -> None:
+    time.sleep(delay)
+    with _lock:
+        run = _runs[run_id]
+        run["status"] = "completed"
+        payload = dict(run)
+    if webhook_url:
+        try:
+            status = post_callback(webhook_url, payload, secret)
+            print(f"callback {run_id} -> {webhook_url}: {status}")
+        except Exception as e:
+            print(f"callback {run_id} failed: {e}")
+
+
+class Handler(BaseHTTPRequestHandler):
+    delay = 1.0
+    secret = ""
+
+    def _json(self, status: int, data: dict) -> None:
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        request = json.loads(body or b"{}")
+        records = _fake_records(request.get("input", []))
+
+        if self.path == "/v1/pipes/run/sync":
+            self._json(200, {"id": str(uuid.uuid4()), "status": "completed", "records": records})
+        elif self.path == "/v1/pipes/run":
+            run_id = str(uuid.uuid4())
+            with _lock:
+                _runs[run_id] = {"id": run_id, "status": "processing", "records": records}
+            webhook_url = (request.get("config") or {}).get("webhook_url")
+            threading.Thread(
+                target=_complete_later,
+                args=(run_id, webhook_url, self.delay, self.secret),
+                daemon=True,
+            ).start()
+            self._json(200, {"id": run_id, "status": "processing"})
+        else:
+            self._json(404, {"error": "not found"})
+
+    def do_GET(self):
+        prefix = "/v1/pipes/check/"
+        if not self.path.startswith(prefix):
+            self._json(404, {"error": "not found"})
+            return
+        with _lock:
+            run = _runs.get(self.path[len(prefix):])
+            data = dict(run) if run else None
+        if data is None:
+            self._json(404, {"error": "unknown run"})
+        elif data["status"] != "completed":
+            self._json(200, {"id": data["id"], "status": data["status"]})
+        else:
+            self._json(200, data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local pipe0 stand-in")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--delay", type=float, default=1.0, help="Seconds until async runs complete")
+    parser.add_argument("--secret", default=os.getenv("PIPE0_WEBHOOK_SECRET", ""), help="Webhook signing secret")
+    parser.add_argument("--send", metavar="RUN_ID", help="Post one completed callback for RUN_ID and exit")
+    parser.add_argument("--to", help="Webhook URL for --send")
+    args = parser.parse_args()
+
+    if args.send:
+        payload = {"id": args.send, "status": "completed", "records": _fake_records([{"id": 1}])}
+        print(post_callback(args.to, payload, args.secret))
+        return
+
+    Handler.delay = args.delay
+    Handler.secret = args.secret
+    server = ThreadingHTTPServer(("0.0.0.0", args.port), Handler)
+    print(f"pipe0 stand-in listening on :{args.port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
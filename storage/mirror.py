@@ -0,0 +1,193 @@
+import json
+import logging
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from pydantic import BaseModel, Field
+from models.lead import RawLead
+import config
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS campaigns (
+    campaign_id     TEXT PRIMARY KEY,
+    name            TEXT,
+    data            TEXT NOT NULL,
+    synced_at       TEXT,
+    watermark       TEXT,
+    watermark_ids   TEXT NOT NULL DEFAULT '[]',
+    lead_count      INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS leads (
+    lead_id         TEXT PRIMARY KEY,
+    campaign_id     TEXT NOT NULL,
+    created_at      TEXT,
+    data            TEXT NOT NULL,
+    first_seen_at   TEXT NOT NULL,
+    updated_at      TEXT NOT NULL,
+    enriched_at     TEXT
+);
+CREATE INDEX IF NOT EXISTS leads_campaign ON leads (campaign_id, created_at);
+"""
+
+
+class Watermark(BaseModel):
+    """High-water mark of what has been mirrored for one campaign.
+
+    `created_at` is the newest `RawLead.created_at` seen; `lead_ids` holds
+    the leads sharing that exact timestamp so ties aren't mistaken for new
+    leads on the next sync.
+    """
+    created_at: str | None
+    lead_ids: set[str] = Field(default_factory=set)
+    lead_count: int = 0
+
+    def is_behind(self, lead: RawLead) -> bool:
+        """True if `lead` is older than (or already covered by) the watermark."""
+        if not lead.created_at or not self.created_at:
+            return False
+        if lead.created_at == self.created_at:
+            return lead.lead_id in self.lead_ids
+        return lead.created_at < self.created_at
+
+
+class LeadMirror:
+    """Local SQLite mirror of Aturiya campaigns and leads."""
+
+    def __init__(self, path: str | Path | None = None):
+        self.path = Path(path or config.MIRROR_DB_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def upsert_campaigns(self, campaigns: list[dict]) -> None:
+        """Store the campaign list as returned by `AturiyaClient.list_campaigns`."""
+        with self.conn:
+            self.conn.executemany(
+                """
+                INSERT INTO campaigns (campaign_id, name, data) VALUES (?, ?, ?)
+                ON CONFLICT (campaign_id) DO UPDATE
+                SET name = excluded.name, data = excluded.data
+                """,
+                [(c["id"], c.get("name"), json.dumps(c, default=str)) for c in campaigns],
+            )
+
+    def get_watermark(self, campaign_id: str) -> Watermark | None:
+        """Return the campaign's watermark, or None if it was never synced."""
+        row = self.conn.execute(
+            "SELECT watermark, watermark_ids, lead_count, synced_at FROM campaigns WHERE campaign_id = ?",
+            (campaign_id,),
+        ).fetchone()
+        if not row or row[3] is None:
+            return None
+        return Watermark(created_at=row[0], lead_ids=set(json.loads(row[1])), lead_count=row[2])
+
+    def known_ids(self, lead_ids: list[str]) -> set[str]:
+        """Subset of `lead_ids` already present in the mirror."""
+        if not lead_ids:
+            return set()
+        placeholders = ",".join("?" * len(lead_ids))
+        rows = self.conn.execute(
+            f"SELECT lead_id FROM leads WHERE lead_id IN ({placeholders})", lead_ids
+        )
+        return {row[0] for row in rows}
+
+    def upsert_leads(self, leads: list[RawLead]) -> list[RawLead]:
+        """Insert or update leads. Returns the ones that were new or changed.
+
+        Changed leads have their `enriched_at` cleared so they are picked
+        up again by `unenriched_leads`.
+        """
+        now = datetime.utcnow().isoformat()
+        delta = []
+        with self.conn:
+            for lead in leads:
+                data = lead.model_dump_json()
+                row = self.conn.execute(
+                    "SELECT data FROM leads WHERE lead_id = ?", (lead.lead_id,)
+                ).fetchone()
+                if row and row[0] == data:
+                    continue
+                self.conn.execute(
+                    """
+                    INSERT INTO leads (lead_id, campaign_id, created_at, data, first_seen_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (lead_id) DO UPDATE
+                    SET campaign_id = excluded.campaign_id, created_at = excluded.created_at,
+                        data = excluded.data, updated_at = excluded.updated_at, enriched_at = NULL
+                    """,
+                    (lead.lead_id, lead.campaign_id, lead.created_at, data, now, now),
+                )
+                delta.append(lead)
+        return delta
+
+    def delete_missing(self, campaign_id: str, lead_ids: set[str]) -> int:
+        """Remove a campaign's mirrored leads that aren't in `lead_ids`. Returns the count."""
+        stale = [
+            row[0]
+            for row in self.conn.execute(
+                "SELECT lead_id FROM leads WHERE campaign_id = ?", (campaign_id,)
+            )
+            if row[0] not in lead_ids
+        ]
+        with self.conn:
+            self.conn.executemany("DELETE FROM leads WHERE lead_id = ?", [(lead_id,) for lead_id in stale])
+        return len(stale)
+
+    def advance_watermark(self, campaign_id: str) -> Watermark:
+        """Recompute and persist the campaign watermark from mirrored leads."""
+        (count,) = self.conn.execute(
+            "SELECT COUNT(*) FROM leads WHERE campaign_id = ?", (campaign_id,)
+        ).fetchone()
+        (newest,) = self.conn.execute(
+            "SELECT MAX(created_at) FROM leads WHERE campaign_id = ?", (campaign_id,)
+        ).fetchone()
+        ids = [
+            row[0]
+            for row in self.conn.execute(
+                "SELECT lead_id FROM leads WHERE campaign_id = ? AND created_at = ?",
+                (campaign_id, newest),
+            )
+        ]
+        with self.conn:
+            self.conn.execute(
+                """
+                INSERT INTO campaigns (campaign_id, data, synced_at, watermark, watermark_ids, lead_count)
+                VALUES (?, '{}', ?, ?, ?, ?)
+                ON CONFLICT (campaign_id) DO UPDATE
+                SET synced_at = excluded.synced_at, watermark = excluded.watermark,
+                    watermark_ids = excluded.watermark_ids, lead_count = excluded.lead_count
+                """,
+                (campaign_id, datetime.utcnow().isoformat(), newest, json.dumps(ids), count),
+            )
+        return Watermark(created_at=newest, lead_ids=set(ids), lead_count=count)
+
+    def _select(self, query: str, params: tuple) -> list[RawLead]:
+        return [RawLead.model_validate_json(row[0]) for row in self.conn.execute(query, params)]
+
+    def leads(self, campaign_id: str) -> list[RawLead]:
+        """All mirrored leads for a campaign, oldest first."""
+        return self._select(
+            "SELECT data FROM leads WHERE campaign_id = ? ORDER BY created_at, lead_id",
+            (campaign_id,),
+        )
+
+    def unenriched_leads(self, campaign_id: str) -> list[RawLead]:
+        """Mirrored leads that are new or changed since they were last enriched."""
+        return self._select(
+            "SELECT data FROM leads WHERE campaign_id = ? AND enriched_at IS NULL ORDER BY created_at, lead_id",
+            (campaign_id,),
+        )
+
+    def mark_enriched(self, lead_ids: list[str]) -> None:
+        """Record that these leads have been enriched."""
+        now = datetime.utcnow().isoformat()
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE leads SET enriched_at = ? WHERE lead_id = ?",
+                [(now, lead_id) for lead_id in lead_ids],
+            )
@@ -0,0 +1,251 @@
+import json
+import logging
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from pydantic import BaseModel
+from models.lead import LeadIdentity, EnrichedLead
+import config
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS batches (
+    batch_id        INTEGER PRIMARY KEY AUTOINCREMENT,
+    job             TEXT NOT NULL,
+    identities      TEXT NOT NULL,
+    state           TEXT NOT NULL DEFAULT 'pending',
+    lease_owner     TEXT,
+    lease_expires   REAL,
+    attempts        INTEGER NOT NULL DEFAULT 0,
+    last_error      TEXT,
+    created_at      REAL NOT NULL,
+    done_at         REAL
+);
+CREATE INDEX IF NOT EXISTS batches_claim ON batches (job, state, lease_expires);
+CREATE TABLE IF NOT EXISTS queued_identities (
+    job             TEXT NOT NULL,
+    identity_key    TEXT NOT NULL,
+    batch_id        INTEGER NOT NULL,
+    PRIMARY KEY (job, identity_key)
+);
+CREATE TABLE IF NOT EXISTS results (
+    job             TEXT NOT NULL,
+    lead_id         TEXT NOT NULL,
+    batch_id        INTEGER NOT NULL,
+    data            TEXT NOT NULL,
+    committed_at    REAL NOT NULL,
+    PRIMARY KEY (job, lead_id)
+);
+"""
+
+
+class Lease(BaseModel):
+    """A batch claimed by one worker until `expires` (epoch seconds)."""
+    batch_id: int
+    job: str
+    owner: str
+    expires: float
+    attempts: int
+    identities: list[LeadIdentity]
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class WorkQueue:
+    """Durable SQLite queue of enrichment batches with time-limited leases.
+
+    `main.py --enqueue` fills a job with batches of canonical identities;
+    any number of `worker.py` processes then `claim` batches. A lease that
+    isn't completed before it expires (crashed or stalled worker) becomes
+    claimable again. Results are only committed by the current lease
+    holder and are keyed by (job, lead_id), so a reclaimed batch can never
+    produce duplicate output. The database runs in WAL mode, which needs
+    every process on the same host (WAL relies on shared memory and does
+    not work over a network filesystem), so the queue is single-host.
+    """
+
+    def __init__(self, path: str | Path | None = None):
+        self.path = Path(path or config.QUEUE_DB_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    @contextmanager
+    def _write(self):
+        """Serialize writers across processes with BEGIN IMMEDIATE."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.conn
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    def enqueue(self, job: str, identities: list[LeadIdentity], batch_size: int | None = None) -> int:
+        """Split identities into batches and add them to `job`.
+
+        Identities already queued for the job are skipped, so re-running
+        an enqueue never schedules the same person twice. Returns the
+        number of batches added.
+        """
+        batch_size = batch_size or config.PIPE0_BATCH_SIZE
+        now = time.time()
+        added = 0
+        with self._write() as conn:
+            queued = {
+                row[0]
+                for row in conn.execute(
+                    "SELECT identity_key FROM queued_identities WHERE job = ?", (job,)
+                )
+            }
+            fresh = [identity for identity in identities if identity.key not in queued]
+            for i in range(0, len(fresh), batch_size):
+                batch = fresh[i : i + batch_size]
+                cursor = conn.execute(
+                    "INSERT INTO batches (job, identities, created_at) VALUES (?, ?, ?)",
+                    (job, json.dumps([identity.model_dump() for identity in batch]), now),
+                )
+                conn.executemany(
+                    "INSERT INTO queued_identities (job, identity_key, batch_id) VALUES (?, ?, ?)",
+                    [(job, identity.key, cursor.lastrowid) for identity in batch],
+                )
+                added += 1
+        logger.info(
+            "Enqueued %d batches for job %s (%d identities, %d already queued)",
+            added,
+            job,
+            len(fresh),
+            len(identities) - len(fresh),
+        )
+        return added
+
+    def claim(self, owner: str, job: str | None = None, lease_seconds: float | None = None) -> Lease | None:
+        """Lease the oldest pending (or expired) batch, or return None if there is none."""
+        lease_seconds = lease_seconds or config.QUEUE_LEASE_SECONDS
+        now = time.time()
+        with self._write() as conn:
+            row = conn.execute(
+                """
+                SELECT batch_id, job, identities, attempts FROM batches
+                WHERE (state = 'pending' OR (state = 'leased' AND lease_expires < ?))
+                  AND (? IS NULL OR job = ?)
+                ORDER BY batch_id LIMIT 1
+                """,
+                (now, job, job),
+            ).fetchone()
+            if row is None:
+                return None
+            batch_id, batch_job, identities, attempts = row
+            expires = now + lease_seconds
+            conn.execute(
+                """
+                UPDATE batches SET state = 'leased', lease_owner = ?, lease_expires = ?,
+                    attempts = attempts + 1
+                WHERE batch_id = ?
+                """,
+                (owner, expires, batch_id),
+            )
+        if attempts:
+            logger.info("Reclaimed batch %d (attempt %d)", batch_id, attempts + 1)
+        return Lease(
+            batch_id=batch_id,
+            job=batch_job,
+            owner=owner,
+            expires=expires,
+            attempts=attempts + 1,
+            identities=json.loads(identities),
+        )
+
+    def _holds(self, conn: sqlite3.Connection, lease: Lease) -> bool:
+        row = conn.execute(
+            "SELECT state, lease_owner FROM batches WHERE batch_id = ?", (lease.batch_id,)
+        ).fetchone()
+        return row is not None and row[0] == "leased" and row[1] == lease.owner
+
+    def renew(self, lease: Lease, lease_seconds: float | None = None) -> bool:
+        """Extend a lease; False if it was lost to another worker."""
+        lease_seconds = lease_seconds or config.QUEUE_LEASE_SECONDS
+        with self._write() as conn:
+            if not self._holds(conn, lease):
+                return False
+            lease.expires = time.time() + lease_seconds
+            conn.execute(
+                "UPDATE batches SET lease_expires = ? WHERE batch_id = ?",
+                (lease.expires, lease.batch_id),
+            )
+        return True
+
+    def complete(self, lease: Lease, leads: list[EnrichedLead]) -> bool:
+        """Commit a batch's results and mark it done.
+
+        Only the current lease holder can commit; a worker whose lease was
+        reclaimed gets False back and its results are discarded.
+        """
+        now = time.time()
+        with self._write() as conn:
+            if not self._holds(conn, lease):
+                logger.warning("Lease on batch %d lost; discarding results", lease.batch_id)
+                return False
+            conn.executemany(
+                """
+                INSERT OR IGNORE INTO results (job, lead_id, batch_id, data, committed_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                [(lease.job, lead.lead_id, lease.batch_id, lead.model_dump_json(), now) for lead in leads],
+            )
+            conn.execute(
+                "UPDATE batches SET state = 'done', lease_owner = NULL, done_at = ? WHERE batch_id = ?",
+                (now, lease.batch_id),
+            )
+        return True
+
+    def fail(self, lease: Lease, error: str, max_attempts: int | None = None) -> None:
+        """Release a batch after an error, or park it as failed once out of attempts."""
+        max_attempts = max_attempts or config.QUEUE_MAX_ATTEMPTS
+        state = "failed" if lease.attempts >= max_attempts else "pending"
+        with self._write() as conn:
+            if not self._holds(conn, lease):
+                return
+            conn.execute(
+                """
+                UPDATE batches SET state = ?, lease_owner = NULL, lease_expires = NULL, last_error = ?
+                WHERE batch_id = ?
+                """,
+                (state, error, lease.batch_id),
+            )
+        logger.warning("Batch %d %s: %s", lease.batch_id, "failed" if state == "failed" else "released", error)
+
+    def counts(self, job: str | None = None) -> dict[str, int]:
+        """Number of batches per state ("pending", "leased", "done", "failed")."""
+        rows = self.conn.execute(
+            "SELECT state, COUNT(*) FROM batches WHERE (? IS NULL OR job = ?) GROUP BY state",
+            (job, job),
+        )
+        counts = {"pending": 0, "leased": 0, "done": 0, "failed": 0}
+        counts.update(dict(rows.fetchall()))
+        return counts
+
+    def failed_identities(self, job: str) -> list[LeadIdentity]:
+        """Identities in the job's batches that ran out of attempts."""
+        rows = self.conn.execute(
+            "SELECT identities FROM batches WHERE job = ? AND state = 'failed' ORDER BY batch_id", (job,)
+        )
+        return [LeadIdentity.model_validate(item) for row in rows for item in json.loads(row[0])]
+
+    def results(self, job: str) -> list[EnrichedLead]:
+        """All committed results for a job, in batch order."""
+        rows = self.conn.execute(
+            "SELECT data FROM results WHERE job = ? ORDER BY batch_id, rowid", (job,)
+        )
+        return [EnrichedLead.model_validate_json(row[0]) for row in rows]
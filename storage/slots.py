@@ -0,0 +1,239 @@
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+import config
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tickets (
+    ticket_id       INTEGER PRIMARY KEY AUTOINCREMENT,
+    lane            TEXT NOT NULL,
+    cost            INTEGER NOT NULL,
+    tag             REAL NOT NULL,
+    owner           TEXT NOT NULL,
+    enqueued_at     REAL NOT NULL,
+    granted_at      REAL,
+    heartbeat       REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tickets_queued ON tickets (granted_at, lane, ticket_id);
+CREATE TABLE IF NOT EXISTS lanes (
+    lane            TEXT PRIMARY KEY,
+    finish          REAL NOT NULL DEFAULT 0,
+    dispatched      INTEGER NOT NULL DEFAULT 0,
+    rejected        INTEGER NOT NULL DEFAULT 0,
+    wait_total      REAL NOT NULL DEFAULT 0,
+    wait_max        REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS clock (
+    id              INTEGER PRIMARY KEY CHECK (id = 0),
+    vtime           REAL NOT NULL
+);
+INSERT OR IGNORE INTO clock (id, vtime) VALUES (0, 0);
+"""
+
+
+class SlotTable:
+    """Concurrency slots and lane queues shared by every process through SQLite.
+
+    Each request is a ticket: it is queued in its lane with a weighted fair
+    queuing finish tag and later granted one of `capacity` slots. Every
+    process that opens the same database (API, `main.py`, `worker.py`)
+    queues for, and counts against, the same capacity; all of them should
+    run with the same capacity/weights settings. Like the work queue, the
+    table uses WAL mode and so only works between processes on one host.
+
+    Scheduling happens inside `BEGIN IMMEDIATE` transactions whenever a
+    ticket is submitted or released, and on every heartbeat (`touch`);
+    `poll` is a plain read, so waiting tickets never take the writer lock.
+    The `priority_lane` is always served first and `reserved` slots are
+    kept for it; the other lanes get the remaining slots in finish-tag
+    order. Tickets whose owner stops heartbeating for `ticket_ttl` seconds
+    (crashed process) are reaped, so their slots aren't lost.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        reserved: int,
+        weights: dict[str, float],
+        max_queue: dict[str, int],
+        priority_lane: str,
+        path: str | Path | None = None,
+        ticket_ttl: float | None = None,
+    ):
+        self.capacity = capacity
+        self.reserved = reserved
+        self.weights = weights
+        self.max_queue = max_queue
+        self.priority_lane = priority_lane
+        self.ticket_ttl = ticket_ttl or config.DISPATCH_TICKET_TTL
+        self.path = Path(path or config.DISPATCH_DB_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # One connection shared by the process's threads, serialized by _lock
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_SCHEMA)
+        self.conn.executemany("INSERT OR IGNORE INTO lanes (lane) VALUES (?)", [(lane,) for lane in weights])
+
+    def close(self) -> None:
+        self.conn.close()
+
+    @contextmanager
+    def _write(self):
+        """Serialize writers across threads and processes with BEGIN IMMEDIATE."""
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+
+    def _reap(self, conn: sqlite3.Connection, now: float) -> None:
+        cursor = conn.execute("DELETE FROM tickets WHERE heartbeat < ?", (now - self.ticket_ttl,))
+        if cursor.rowcount:
+            logger.warning("Reaped %d dispatch ticket(s) with no heartbeat", cursor.rowcount)
+
+    def _schedule(self, conn: sqlite3.Connection, now: float) -> None:
+        """Grant free slots to queued tickets. Caller holds a write transaction."""
+        self._reap(conn, now)
+        (in_flight,) = conn.execute("SELECT COUNT(*) FROM tickets WHERE granted_at IS NOT NULL").fetchone()
+        free = self.capacity - in_flight
+        if free <= 0:
+            return
+
+        queues: dict[str, list[tuple]] = {lane: [] for lane in self.weights}
+        for row in conn.execute(
+            "SELECT ticket_id, lane, tag, enqueued_at FROM tickets WHERE granted_at IS NULL ORDER BY ticket_id"
+        ):
+            queues.setdefault(row[1], []).append(row)
+
+        (vtime,) = conn.execute("SELECT vtime FROM clock WHERE id = 0").fetchone()
+        while free > 0:
+            if queues[self.priority_lane]:
+                ticket = queues[self.priority_lane].pop(0)
+            elif in_flight < self.capacity - self.reserved:
+                heads = [q[0] for lane, q in queues.items() if lane != self.priority_lane and q]
+                if not heads:
+                    break
+                ticket = min(heads, key=lambda t: t[2])
+                queues[ticket[1]].pop(0)
+            else:
+                break
+
+            ticket_id, lane, tag, enqueued_at = ticket
+            wait = now - enqueued_at
+            conn.execute("UPDATE tickets SET granted_at = ? WHERE ticket_id = ?", (now, ticket_id))
+            conn.execute(
+                """
+                UPDATE lanes SET dispatched = dispatched + 1, wait_total = wait_total + ?,
+                    wait_max = MAX(wait_max, ?)
+                WHERE lane = ?
+                """,
+                (wait, wait, lane),
+            )
+            vtime = max(vtime, tag)
+            in_flight += 1
+            free -= 1
+        conn.execute("UPDATE clock SET vtime = ? WHERE id = 0", (vtime,))
+
+    def submit(self, lane: str, cost: int, owner: str) -> int | None:
+        """Queue a ticket on `lane`; returns its id, or None if the lane is full."""
+        now = time.time()
+        with self._write() as conn:
+            self._reap(conn, now)
+            (queued,) = conn.execute(
+                "SELECT COUNT(*) FROM tickets WHERE lane = ? AND granted_at IS NULL", (lane,)
+            ).fetchone()
+            if queued >= self.max_queue[lane]:
+                conn.execute("UPDATE lanes SET rejected = rejected + 1 WHERE lane = ?", (lane,))
+                return None
+
+            (vtime,) = conn.execute("SELECT vtime FROM clock WHERE id = 0").fetchone()
+            (finish,) = conn.execute("SELECT finish FROM lanes WHERE lane = ?", (lane,)).fetchone()
+            tag = max(vtime, finish) + max(cost, 1) / self.weights[lane]
+            conn.execute("UPDATE lanes SET finish = ? WHERE lane = ?", (tag, lane))
+            cursor = conn.execute(
+                """
+                INSERT INTO tickets (lane, cost, tag, owner, enqueued_at, heartbeat)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (lane, cost, tag, owner, now, now),
+            )
+            self._schedule(conn, now)
+            return cursor.lastrowid
+
+    def poll(self, ticket_id: int) -> bool | None:
+        """Report whether the ticket holds a slot (read-only).
+
+        Returns None if the ticket no longer exists (it was reaped).
+        """
+        with self._lock:
+            row = self.conn.execute("SELECT granted_at FROM tickets WHERE ticket_id = ?", (ticket_id,)).fetchone()
+        if row is None:
+            return None
+        return row[0] is not None
+
+    def release(self, ticket_id: int) -> None:
+        """Give up a ticket (granted or still queued) and hand its slot on."""
+        now = time.time()
+        with self._write() as conn:
+            conn.execute("DELETE FROM tickets WHERE ticket_id = ?", (ticket_id,))
+            self._schedule(conn, now)
+
+    def touch(self, ticket_ids: list[int]) -> None:
+        """Heartbeat tickets that are still in use, then reap and reschedule.
+
+        Rescheduling here hands out slots freed by reaping even when no
+        other process submits or releases anything.
+        """
+        now = time.time()
+        with self._write() as conn:
+            conn.executemany(
+                "UPDATE tickets SET heartbeat = ? WHERE ticket_id = ?",
+                [(now, ticket_id) for ticket_id in ticket_ids],
+            )
+            self._schedule(conn, now)
+
+    def stats(self) -> dict:
+        """Queue depth, in-flight count and wait times per lane, across all processes."""
+        now = time.time()
+        with self._lock:
+            tickets = self.conn.execute(
+                """
+                SELECT lane, SUM(granted_at IS NULL), SUM(granted_at IS NOT NULL),
+                    MIN(CASE WHEN granted_at IS NULL THEN enqueued_at END)
+                FROM tickets WHERE heartbeat >= ? GROUP BY lane
+                """,
+                (now - self.ticket_ttl,),
+            ).fetchall()
+            totals = self.conn.execute(
+                "SELECT lane, dispatched, rejected, wait_total, wait_max FROM lanes"
+            ).fetchall()
+        live = {row[0]: row[1:] for row in tickets}
+        lanes = {}
+        for lane, dispatched, rejected, wait_total, wait_max in totals:
+            if lane not in self.weights:
+                continue
+            queued, in_flight, oldest = live.get(lane, (0, 0, None))
+            lanes[lane] = {
+                "queued": queued,
+                "in_flight": in_flight,
+                "dispatched": dispatched,
+                "rejected": rejected,
+                "avg_wait_s": wait_total / dispatched if dispatched else 0.0,
+                "max_wait_s": wait_max,
+                "oldest_queued_s": now - oldest if oldest else 0.0,
+            }
+        return {
+            "capacity": self.capacity,
+            "reserved_interactive": self.reserved,
+            "in_flight": sum(lane["in_flight"] for lane in lanes.values()),
+            "lanes": lanes,
+        }
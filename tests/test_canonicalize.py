@@ -0,0 +1,87 @@
+from models.lead import RawLead
+from pipeline.canonicalize import canonicalize_leads
+from utils.identity import normalize_linkedin_url
+
+
+def _lead(lead_id, name, **fields):
+    return RawLead(lead_id=lead_id, agent_id="a", campaign_id="c", name=name, **fields)
+
+
+def _groups(leads):
+    return sorted(sorted(m.lead_id for m in identity.members) for identity in canonicalize_leads(leads))
+
+
+def test_same_linkedin_url_merges_across_formats():
+    leads = [
+        _lead("1", "Jane Doe", linkedin_url="http://uk.linkedin.com/in/Jane-Doe/en/?trk=x"),
+        _lead("2", "Jane D.", linkedin_url="https://www.linkedin.com/in/jane-doe"),
+    ]
+    assert _groups(leads) == [["1", "2"]]
+
+
+def test_same_email_same_person_merges():
+    leads = [
+        _lead("1", "Jane Doe", email="Jane@Acme.io", linkedin_url="linkedin.com/in/jane"),
+        _lead("2", "jane  doe", email="jane@acme.io"),
+    ]
+    identities = canonicalize_leads(leads)
+    assert len(identities) == 1
+    assert identities[0].lead.linkedin_url == "https://www.linkedin.com/in/jane"
+
+
+def test_role_address_with_different_names_does_not_merge():
+    leads = [
+        _lead("1", "Alice Ng", email="sales@acme.io"),
+        _lead("2", "Bob Ruiz", email="sales@acme.io"),
+    ]
+    identities = canonicalize_leads(leads)
+    assert _groups(leads) == [["1"], ["2"]]
+    assert len({identity.key for identity in identities}) == 2
+
+
+def test_later_copies_join_their_own_group_after_refused_merge():
+    leads = [
+        _lead("1", "Alice Ng", email="sales@acme.io"),
+        _lead("2", "Bob Ruiz", email="sales@acme.io"),
+        _lead("3", "Bob Ruiz", email="sales@acme.io"),
+        _lead("4", "Alice Ng", email="sales@acme.io"),
+    ]
+    assert _groups(leads) == [["1", "4"], ["2", "3"]]
+
+
+def test_shared_email_with_conflicting_linkedin_does_not_merge():
+    leads = [
+        _lead("1", "Alice Ng", email="team@acme.io", linkedin_url="linkedin.com/in/alice"),
+        _lead("2", "Alice Ng", email="team@acme.io", linkedin_url="linkedin.com/in/alice-ng-2"),
+    ]
+    assert _groups(leads) == [["1"], ["2"]]
+
+
+def test_same_name_and_domain_with_different_linkedin_does_not_merge():
+    leads = [
+        _lead("1", "John Smith", website="bigcorp.com", linkedin_url="https://linkedin.com/in/js1"),
+        _lead("2", "John Smith", website="bigcorp.com", linkedin_url="https://linkedin.com/in/js2"),
+    ]
+    assert _groups(leads) == [["1"], ["2"]]
+
+
+def test_name_and_domain_only_used_without_identifiers():
+    leads = [
+        _lead("1", "John Smith", website="https://bigcorp.com"),
+        _lead("2", "john smith", website="www.bigcorp.com/about"),
+        _lead("3", "John Smith", website="bigcorp.com", email="jsmith@bigcorp.com"),
+    ]
+    assert _groups(leads) == [["1", "2"], ["3"]]
+
+
+def test_pub_urls_keep_id_segments():
+    a = normalize_linkedin_url("https://www.linkedin.com/pub/john-smith/12/345/678")
+    b = normalize_linkedin_url("https://www.linkedin.com/pub/john-smith/9a/bcd/ef0/")
+    assert a == "https://www.linkedin.com/pub/john-smith/12/345/678"
+    assert a != b
+
+
+def test_percent_encoded_slug_matches_unicode():
+    assert normalize_linkedin_url("https://www.linkedin.com/in/Ren%C3%A9-Dupont") == normalize_linkedin_url(
+        "https://linkedin.com/in/rené-dupont/"
+    )
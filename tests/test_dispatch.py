@@ -0,0 +1,29 @@
+import pytest
+from clients.dispatch import BULK, DispatchedPipe0Client, Pipe0Dispatcher
+from clients.pipe0 import Pipe0Client
+
+
+def test_async_run_holds_slot_until_waited(tmp_path, monkeypatch):
+    monkeypatch.setattr(Pipe0Client, "enrich_async", lambda self, batch: "run-1")
+    monkeypatch.setattr(Pipe0Client, "wait_for_run", lambda self, run_id, *a, **kw: {"id": run_id})
+    dispatcher = Pipe0Dispatcher(capacity=2, reserved=1, path=tmp_path / "d.db")
+    client = DispatchedPipe0Client(dispatcher, BULK, api_key="test")
+
+    run_id = client.enrich_async([{"name": "Jane"}])
+    assert dispatcher.stats()["lanes"][BULK]["in_flight"] == 1
+
+    assert client.wait_for_run(run_id) == {"id": "run-1"}
+    assert dispatcher.stats()["lanes"][BULK]["in_flight"] == 0
+
+
+def test_failed_submit_releases_slot(tmp_path, monkeypatch):
+    def boom(self, batch):
+        raise RuntimeError("pipe0 down")
+
+    monkeypatch.setattr(Pipe0Client, "enrich_async", boom)
+    dispatcher = Pipe0Dispatcher(capacity=2, reserved=1, path=tmp_path / "d.db")
+    client = DispatchedPipe0Client(dispatcher, BULK, api_key="test")
+
+    with pytest.raises(RuntimeError):
+        client.enrich_async([{"name": "Jane"}])
+    assert dispatcher.stats()["in_flight"] == 0
@@ -0,0 +1,102 @@
+import pytest
+import config
+from models.lead import RawLead
+from pipeline.ingest import sync_campaign
+from storage.mirror import LeadMirror
+
+
+def _lead(n, created_at=None):
+    return RawLead(
+        lead_id=str(n),
+        agent_id="a",
+        campaign_id="c",
+        name=f"Lead {n}",
+        created_at=created_at if created_at is not None else f"2026-01-01T00:00:{n:02d}",
+    )
+
+
+class FakeAturiya:
+    """Serves a fixed lead list in API order and records the pages read."""
+
+    def __init__(self, leads):
+        self.leads = leads
+        self.pages = []
+
+    def get_leads(self, campaign_id, page=1, per_page=50):
+        self.pages.append(page)
+        total_pages = max(1, -(-len(self.leads) // per_page))
+        start = (page - 1) * per_page
+        pagination = {"page": page, "total_pages": total_pages, "has_next_page": page < total_pages}
+        return self.leads[start : start + per_page], pagination
+
+    def get_all_leads(self, campaign_id):
+        return list(self.leads)
+
+
+@pytest.fixture
+def mirror(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "ATURIYA_PAGE_SIZE", 2)
+    return LeadMirror(tmp_path / "mirror.db")
+
+
+def _seed(mirror, leads):
+    sync_campaign(FakeAturiya(leads), mirror, "c")
+    mirror.mark_enriched([lead.lead_id for lead in leads])
+
+
+def _new_ids(mirror):
+    return [lead.lead_id for lead in mirror.unenriched_leads("c")]
+
+
+def test_oldest_first_skips_to_last_mirrored_page(mirror):
+    _seed(mirror, [_lead(n) for n in range(1, 10)])
+    client = FakeAturiya([_lead(n) for n in range(1, 12)])
+
+    sync_campaign(client, mirror, "c")
+
+    # 9 mirrored leads at 2 per page: jump from page 1 straight to page 4
+    assert client.pages == [1, 4, 5, 6]
+    assert _new_ids(mirror) == ["10", "11"]
+
+
+def test_newest_first_stops_at_watermark(mirror):
+    _seed(mirror, [_lead(n) for n in range(9, 0, -1)])
+    client = FakeAturiya([_lead(n) for n in range(11, 0, -1)])
+
+    sync_campaign(client, mirror, "c")
+
+    assert client.pages == [1, 2]
+    assert _new_ids(mirror) == ["10", "11"]
+
+
+def test_unknown_order_reads_every_page(mirror):
+    same = "2026-01-01T00:00:00"
+    _seed(mirror, [_lead(n, same) for n in range(1, 6)])
+    client = FakeAturiya([_lead(n, same) for n in range(1, 8)])
+
+    sync_campaign(client, mirror, "c")
+
+    assert client.pages == [1, 2, 3, 4]
+    assert _new_ids(mirror) == ["6", "7"]
+
+
+def test_new_lead_tied_with_watermark_is_not_missed(mirror):
+    tie = "2026-01-01T00:00:05"
+    _seed(mirror, [_lead(5, tie), _lead(4, tie), _lead(3), _lead(2), _lead(1)])
+    # Lead 6 shares the watermark timestamp but wasn't mirrored yet
+    client = FakeAturiya([_lead(7), _lead(6, tie), _lead(5, tie), _lead(4, tie), _lead(3), _lead(2), _lead(1)])
+
+    sync_campaign(client, mirror, "c")
+
+    assert client.pages == [1, 2]
+    assert sorted(_new_ids(mirror)) == ["6", "7"]
+
+
+def test_full_sync_returns_api_order_and_drops_deleted(mirror):
+    _seed(mirror, [_lead(n) for n in range(1, 6)])
+    upstream = [_lead(3), _lead(1), _lead(5)]
+
+    fetched = sync_campaign(FakeAturiya(upstream), mirror, "c", full=True)
+
+    assert [lead.lead_id for lead in fetched] == ["3", "1", "5"]
+    assert [lead.lead_id for lead in mirror.leads("c")] == ["1", "3", "5"]
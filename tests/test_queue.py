@@ -0,0 +1,27 @@
+from models.lead import LeadIdentity, RawLead
+from pipeline.enrich import without_enrichment
+from storage.queue import WorkQueue
+
+
+def _identity(lead_id):
+    members = [
+        RawLead(lead_id=f"{lead_id}{suffix}", agent_id="a", campaign_id=c, name=f"Lead {lead_id}")
+        for suffix, c in (("a", "c1"), ("b", "c2"))
+    ]
+    return LeadIdentity(key=lead_id, lead=members[0], members=members)
+
+
+def test_failed_batches_are_collected_unenriched(tmp_path):
+    queue = WorkQueue(tmp_path / "q.db")
+    queue.enqueue("job", [_identity("1"), _identity("2")], batch_size=1)
+
+    lease = queue.claim("w", job="job")
+    queue.fail(lease, "pipe0 down", max_attempts=1)
+
+    assert queue.counts("job")["failed"] == 1
+    identities = queue.failed_identities("job")
+    assert [identity.key for identity in identities] == ["1"]
+
+    leads = without_enrichment(identities)
+    assert len(leads) == 2
+    assert all(lead.enrichment_metadata.pipe0_run_id is None for lead in leads)
@@ -0,0 +1,31 @@
+from clients.runs import RunRegistry
+
+
+def test_resolve_wakes_waiter():
+    registry = RunRegistry()
+    registry.expect("r1")
+    assert registry.resolve("r1", {"id": "r1", "status": "completed"})
+    assert registry.wait("r1", timeout=0) == {"id": "r1", "status": "completed"}
+
+
+def test_callback_before_expect_is_kept():
+    registry = RunRegistry()
+    assert registry.resolve("r1", {"id": "r1"})
+    registry.expect("r1")
+    assert registry.wait("r1", timeout=0) == {"id": "r1"}
+
+
+def test_duplicate_delivery():
+    registry = RunRegistry()
+    registry.expect("r1")
+    assert registry.resolve("r1", {"id": "r1"})
+    assert not registry.resolve("r1", {"id": "r1"})
+
+
+def test_late_duplicate_after_pop_is_not_stored():
+    registry = RunRegistry()
+    registry.expect("r1")
+    registry.resolve("r1", {"id": "r1"})
+    registry.pop("r1")
+    assert not registry.resolve("r1", {"id": "r1"})
+    assert "r1" not in registry._runs
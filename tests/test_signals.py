@@ -0,0 +1,107 @@
+from clients.pipe0 import Pipe0Client
+from models.lead import RawLead
+from models.signals import flatten_signals, merge_signals
+from pipeline.enrich import _merge_lead
+
+
+def _field(value, status="completed"):
+    return {"status": status, "value": value}
+
+
+RESPONSE = {
+    "id": "run-1",
+    "records": {
+        "1": {
+            "id": 1,
+            "fields": {
+                "company_website_url": {"status": "completed", "value": "acme.io", "resolved_by": {"ref": "input"}},
+                "company_description": _field("Acme makes anvils."),
+                "company_industry": _field("Manufacturing"),
+                "headcount": _field("51-200"),
+                "founded_year": _field("1949"),
+                "technology_list": _field(["Python", "React"]),
+                "funding_total_usd": _field(1500000),
+                "funding_history": _field([{"round": "Seed", "amount": 1500000}]),
+                "company_news_summary": _field("Acme opened a new plant."),
+                "crustdata_post_list": _field([{"text": "Hiring!"}, "We shipped"]),
+            },
+        },
+        "2": {
+            "id": 2,
+            "fields": {
+                "company_description": _field(None, "no_result"),
+                "company_news_summary": _field("Quiet quarter."),
+                "post_list_string": _field("Post A; Post B"),
+            },
+        },
+    },
+}
+
+
+def _enriched():
+    enrichments = Pipe0Client.parse_enrichment(RESPONSE, {1: "a", 2: "b"})
+    raw = {
+        lead_id: RawLead(lead_id=lead_id, agent_id="x", campaign_id="c", name=lead_id.upper())
+        for lead_id in ("a", "b")
+    }
+    return enrichments, {lead_id: _merge_lead(raw[lead_id], enrichments[lead_id]) for lead_id in raw}
+
+
+def test_merge_signals_full_record():
+    enrichments, _ = _enriched()
+    signals = merge_signals(enrichments["a"])
+    assert signals["company_overview"].model_dump() == {
+        "description": "Acme makes anvils.",
+        "industry": "Manufacturing",
+        "headcount": "51-200",
+        "founded_year": "1949",
+        "region": None,
+        "estimated_revenue": None,
+    }
+    assert signals["tech_stack"] == ["Python", "React"]
+    assert signals["funding"].model_dump() == {
+        "total_funding_usd": 1500000,
+        "funding_history": [{"round": "Seed", "amount": 1500000}],
+        "news_summary": "Acme opened a new plant.",
+    }
+    assert signals["linkedin_posts"] == ["Hiring!", "We shipped"]
+
+
+def test_merge_signals_sparse_record():
+    enrichments, _ = _enriched()
+    # News alone doesn't create funding info; posts fall back to the joined string
+    assert merge_signals(enrichments["b"]) == {
+        "company_overview": None,
+        "tech_stack": None,
+        "funding": None,
+        "linkedin_posts": ["Post A; Post B"],
+    }
+    assert enrichments["b"]["_signals_missed"] == ["company_description"]
+
+
+def test_flatten_signals_rows():
+    _, leads = _enriched()
+    assert flatten_signals(leads["a"]) == {
+        "company_description": "Acme makes anvils.",
+        "company_industry": "Manufacturing",
+        "company_headcount": "51-200",
+        "company_founded_year": "1949",
+        "company_region": None,
+        "company_estimated_revenue": None,
+        "tech_stack": "Python, React",
+        "total_funding_usd": 1500000,
+        "funding_history": '[{"round": "Seed", "amount": 1500000}]',
+        "company_news_summary": "Acme opened a new plant.",
+        "linkedin_posts": "Hiring! | We shipped",
+    }
+    assert flatten_signals(leads["b"]) == {"linkedin_posts": "Post A; Post B"}
+    assert leads["a"].enrichment_metadata.pipe0_run_id == "run-1"
+
+
+def test_unconfigured_signal_is_sent(monkeypatch):
+    import config
+
+    monkeypatch.setattr(config, "ENRICHMENT_PIPES", {"funding": False})
+    pipes = [pipe["pipe_id"] for pipe in Pipe0Client(api_key="test")._build_pipes_list()]
+    assert "company:funding:leadmagic@1" not in pipes
+    assert "company:overview@2" in pipes
@@ -0,0 +1,72 @@
+import time
+from storage.slots import SlotTable
+
+WEIGHTS = {"interactive": 8, "bulk": 3, "backfill": 1}
+MAX_QUEUE = {"interactive": 2, "bulk": 8, "backfill": 8}
+
+
+def _table(path, capacity=2, reserved=1):
+    return SlotTable(capacity, reserved, WEIGHTS, MAX_QUEUE, priority_lane="interactive", path=path)
+
+
+def test_reserved_slot_is_kept_for_interactive(tmp_path):
+    table = _table(tmp_path / "d.db")
+    first = table.submit("bulk", 1, "a")
+    second = table.submit("bulk", 1, "a")
+    assert table.poll(first) is True
+    assert table.poll(second) is False
+
+    interactive = table.submit("interactive", 1, "b")
+    assert table.poll(interactive) is True
+
+    table.release(first)
+    # With an interactive run in flight, only the reserved slot is free
+    assert table.poll(second) is False
+    table.release(interactive)
+    assert table.poll(second) is True
+
+
+def test_capacity_is_shared_between_processes(tmp_path):
+    api = _table(tmp_path / "d.db")
+    worker = _table(tmp_path / "d.db")
+    held = worker.submit("bulk", 1, "worker")
+    assert worker.poll(held) is True
+
+    queued = worker.submit("bulk", 1, "worker")
+    bulk = api.stats()["lanes"]["bulk"]
+    assert (bulk["queued"], bulk["in_flight"]) == (1, 1)
+    api.release(held)
+    assert worker.poll(queued) is True
+
+
+def test_full_lane_rejects(tmp_path):
+    table = _table(tmp_path / "d.db", capacity=2, reserved=1)
+    tickets = [table.submit("interactive", 1, "a") for _ in range(5)]
+    assert tickets[-1] is None
+    assert table.stats()["lanes"]["interactive"]["rejected"] == 1
+
+
+def test_dead_tickets_are_reaped(tmp_path):
+    table = _table(tmp_path / "d.db", capacity=2, reserved=1)
+    table.ticket_ttl = 0.05
+    stale = table.submit("bulk", 1, "crashed")
+    assert table.poll(stale) is True
+    time.sleep(0.1)
+    fresh = table.submit("bulk", 1, "alive")
+    assert table.poll(fresh) is True
+    assert table.poll(stale) is None
+
+
+def test_heartbeat_hands_out_slots_of_crashed_owners(tmp_path):
+    table = _table(tmp_path / "d.db", capacity=2, reserved=1)
+    table.ticket_ttl = 0.2
+    crashed = table.submit("bulk", 1, "crashed")
+    waiting = table.submit("bulk", 1, "alive")
+    assert table.poll(crashed) is True
+
+    time.sleep(0.25)
+    # Polling is read-only and can't reclaim the slot on its own
+    assert table.poll(waiting) is False
+    table.touch([waiting])
+    assert table.poll(waiting) is True
+    assert table.poll(crashed) is None
@@ -0,0 +1,82 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+import config
+from api.routes import webhooks
+from clients.pipe0 import Pipe0Client
+from clients.runs import RunRegistry
+
+SECRET = "test-secret"
+
+
+def _sign(body: bytes, secret: str = SECRET) -> str:
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def _post(body: bytes, signature: str | None):
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    request = Request({"type": "http", "method": "POST", "headers": []}, receive)
+    return asyncio.run(webhooks.pipe0_webhook(request, x_pipe0_signature=signature))
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    monkeypatch.setattr(config, "PIPE0_WEBHOOK_SECRET", SECRET)
+    registry = RunRegistry()
+    monkeypatch.setattr(webhooks, "run_registry", registry)
+    return registry
+
+
+def test_verify_webhook(monkeypatch):
+    monkeypatch.setattr(config, "PIPE0_WEBHOOK_SECRET", SECRET)
+    body = b'{"id": "r1"}'
+    assert Pipe0Client.verify_webhook(body, _sign(body))
+    # The "sha256=" prefix is optional
+    assert Pipe0Client.verify_webhook(body, _sign(body).removeprefix("sha256="))
+    assert not Pipe0Client.verify_webhook(body, _sign(body, "other-secret"))
+    assert not Pipe0Client.verify_webhook(body + b" ", _sign(body))
+    assert not Pipe0Client.verify_webhook(body, None)
+
+
+def test_verify_webhook_without_secret_rejects_everything(monkeypatch):
+    monkeypatch.setattr(config, "PIPE0_WEBHOOK_SECRET", None)
+    body = b'{"id": "r1"}'
+    assert not Pipe0Client.verify_webhook(body, _sign(body))
+
+
+def test_bad_signature_is_401(registry):
+    body = json.dumps({"id": "r1", "status": "completed"}).encode()
+    with pytest.raises(HTTPException) as exc:
+        _post(body, _sign(body, "other-secret"))
+    assert exc.value.status_code == 401
+    assert registry.wait("r1", timeout=0) is None
+
+
+@pytest.mark.parametrize("body", [b"not json", b'{"status": "completed"}', b"[1, 2]"])
+def test_malformed_payload_is_400(registry, body):
+    with pytest.raises(HTTPException) as exc:
+        _post(body, _sign(body))
+    assert exc.value.status_code == 400
+
+
+def test_non_terminal_status_is_ignored(registry):
+    body = json.dumps({"id": "r1", "status": "processing"}).encode()
+    assert _post(body, _sign(body)) == {"status": "ignored", "run_id": "r1"}
+    assert registry.wait("r1", timeout=0) is None
+
+
+def test_accepted_then_duplicate(registry):
+    registry.expect("r1")
+    body = json.dumps({"id": "r1", "status": "completed", "records": {}}).encode()
+    assert _post(body, _sign(body)) == {"status": "accepted", "run_id": "r1"}
+    assert registry.wait("r1", timeout=0)["status"] == "completed"
+    assert _post(body, _sign(body)) == {"status": "duplicate", "run_id": "r1"}
+
+    registry.pop("r1")
+    assert _post(body, _sign(body)) == {"status": "duplicate", "run_id": "r1"}
@@ -0,0 +1,34 @@
+import time
+import config
+import pipeline.worker as worker
+from models.lead import LeadIdentity, RawLead
+from storage.queue import WorkQueue
+
+
+def _identity(lead_id):
+    lead = RawLead(lead_id=lead_id, agent_id="a", campaign_id="c", name=f"Lead {lead_id}")
+    return LeadIdentity(key=lead_id, lead=lead, members=[lead])
+
+
+def test_lease_is_renewed_during_slow_enrichment(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "QUEUE_LEASE_SECONDS", 0.3)
+    monkeypatch.setattr(worker, "get_lane_client", lambda lane: None)
+    queue = WorkQueue(tmp_path / "q.db")
+    queue.enqueue("job", [_identity("1")])
+    rival = WorkQueue(tmp_path / "q.db")
+    stolen = []
+
+    def slow_enrich(batch, client=None):
+        # Long past the lease period; nobody else may claim the batch meanwhile
+        for _ in range(4):
+            time.sleep(0.2)
+            lease = rival.claim("rival", job="job")
+            if lease is not None:
+                rival.complete(lease, [])
+            stolen.append(lease)
+        return []
+
+    monkeypatch.setattr(worker, "enrich_batch", slow_enrich)
+    assert worker.run_worker(queue, job="job", owner="w1", poll_interval=0.01) == 1
+    assert stolen == [None] * 4
+    assert queue.counts("job")["done"] == 1
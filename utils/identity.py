@@ -0,0 +1,166 @@
+import hashlib
+import re
+from urllib.parse import unquote, urlsplit
+
+# Free / consumer mailbox providers — an address on one of these says
+# nothing about the lead's company, so it must never be used as a domain.
+GENERIC_EMAIL_DOMAINS = frozenset({
+    # Google
+    "gmail.com", "googlemail.com",
+    # Microsoft
+    "outlook.com", "hotmail.com", "hotmail.co.uk", "hotmail.fr", "hotmail.de",
+    "hotmail.it", "hotmail.es", "live.com", "live.co.uk", "live.fr", "msn.com",
+    "passport.com", "windowslive.com",
+    # Yahoo / AOL / Verizon
+    "yahoo.com", "yahoo.co.uk", "yahoo.co.in", "yahoo.co.jp", "yahoo.fr",
+    "yahoo.de", "yahoo.es", "yahoo.it", "yahoo.ca", "yahoo.com.au",
+    "yahoo.com.br", "ymail.com", "rocketmail.com", "aol.com", "aim.com",
+    "verizon.net",
+    # Apple
+    "icloud.com", "me.com", "mac.com",
+    # Privacy-focused
+    "proton.me", "protonmail.com", "protonmail.ch", "pm.me", "tutanota.com",
+    "tutanota.de", "tuta.io", "hushmail.com", "fastmail.com", "fastmail.fm",
+    "mailfence.com", "startmail.com", "posteo.de", "posteo.net",
+    # Other international providers
+    "gmx.com", "gmx.net", "gmx.de", "gmx.at", "gmx.ch", "web.de", "t-online.de",
+    "freenet.de", "mail.com", "email.com", "zoho.com", "zohomail.com",
+    "yandex.com", "yandex.ru", "ya.ru", "mail.ru", "bk.ru", "inbox.ru",
+    "list.ru", "rambler.ru", "qq.com", "163.com", "126.com", "yeah.net",
+    "sina.com", "sohu.com", "aliyun.com", "naver.com", "daum.net", "hanmail.net",
+    "rediffmail.com", "orange.fr", "wanadoo.fr", "free.fr", "laposte.net",
+    "sfr.fr", "libero.it", "virgilio.it", "tiscali.it", "alice.it",
+    "btinternet.com", "sky.com", "virginmedia.com", "ntlworld.com",
+    "talktalk.net", "seznam.cz", "wp.pl", "o2.pl", "interia.pl", "onet.pl",
+    "bol.com.br", "uol.com.br", "terra.com.br", "shaw.ca", "rogers.com",
+    "sympatico.ca", "bigpond.com", "optusnet.com.au",
+    # US ISPs
+    "comcast.net", "att.net", "sbcglobal.net", "bellsouth.net", "cox.net",
+    "charter.net", "earthlink.net", "juno.com", "netzero.net", "optonline.net",
+    "frontier.com", "windstream.net",
+    # Disposable / catch-all
+    "mailinator.com", "guerrillamail.com", "10minutemail.com", "yopmail.com",
+    "trashmail.com", "tempmail.com",
+})
+
+_LINKEDIN_HOST = re.compile(r"^(?:[a-z]{2,3}\.)?linkedin\.com$")
+# Profile types that identify a person or company on LinkedIn
+_LINKEDIN_KINDS = {"in", "pub", "company", "school", "showcase"}
+
+
+def normalize_domain(value: str | None) -> str | None:
+    """Reduce a URL or bare host to a lowercase registrable-ish domain.
+
+    "https://WWW.Acme.io:443/about?x=1" -> "acme.io"
+    """
+    if not value:
+        return None
+    value = value.strip().lower()
+    if not value:
+        return None
+    if "://" not in value:
+        value = f"//{value}"
+    host = urlsplit(value).hostname or ""
+    host = host.rstrip(".")
+    if host.startswith("www."):
+        host = host[4:]
+    return host or None
+
+
+def normalize_email(email: str | None) -> str | None:
+    """Lowercase and trim an email address; None if it isn't one."""
+    if not email:
+        return None
+    email = email.strip().lower()
+    local, sep, domain = email.rpartition("@")
+    if not sep or not local or not domain:
+        return None
+    return f"{local}@{domain}"
+
+
+def normalize_linkedin_url(url: str | None) -> str | None:
+    """Canonicalize a LinkedIn profile URL.
+
+    Drops scheme differences, "www."/country subdomains, query strings,
+    fragments, trailing slashes and locale subpaths, and decodes
+    percent-escapes, so that e.g.
+    "http://uk.linkedin.com/in/Jane-Doe/en/?trk=x" and
+    "https://www.linkedin.com/in/jane-doe" both become
+    "https://www.linkedin.com/in/jane-doe". Legacy /pub/ URLs keep their
+    trailing ID segments, which are what tells same-named profiles apart.
+
+    Non-LinkedIn URLs are returned lowercased and stripped of their query.
+    """
+    if not url:
+        return None
+    url = url.strip()
+    if not url:
+        return None
+    if "://" not in url:
+        url = f"https://{url}"
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    segments = [s for s in unquote(parts.path).split("/") if s]
+
+    if not _LINKEDIN_HOST.match(host):
+        path = "/".join(segments)
+        return f"https://{host}/{path}".rstrip("/").lower()
+
+    if len(segments) >= 2 and segments[0].lower() in _LINKEDIN_KINDS:
+        kind = segments[0].lower()
+        if kind == "pub":
+            # /pub/<name>/<a>/<b>/<c>[/<locale>] -> name + the three ID segments
+            keep = segments[1:5]
+        else:
+            # /in/<slug>[/<locale>|/details/...] -> slug only
+            keep = segments[1:2]
+        return f"https://www.linkedin.com/{kind}/" + "/".join(s.lower() for s in keep)
+    return "https://www.linkedin.com/" + "/".join(s.lower() for s in segments)
+
+
+def company_domain(email: str | None, website: str | None) -> str | None:
+    """Company domain for a lead: its website, else a non-generic email domain."""
+    domain = normalize_domain(website)
+    if domain:
+        return domain
+    email = normalize_email(email)
+    if email:
+        domain = email.rpartition("@")[2]
+        if domain not in GENERIC_EMAIL_DOMAINS:
+            return domain
+    return None
+
+
+def normalize_name(name: str | None) -> str:
+    """Casefold a person's name and collapse its whitespace."""
+    return " ".join((name or "").casefold().split())
+
+
+def _hash(basis: str) -> str:
+    return hashlib.sha256(basis.encode("utf-8")).hexdigest()
+
+
+def identity_keys(
+    linkedin_url: str | None,
+    email: str | None,
+    name: str | None = None,
+    domain: str | None = None,
+) -> dict[str, str]:
+    """Stable hashes identifying a person across campaigns, by kind.
+
+    "li" is the canonical LinkedIn URL and "em" the normalized email.
+    "nd" (name + company domain) is only produced when the lead has
+    neither, since names collide far too often to outrank either of them.
+    """
+    keys = {}
+    linkedin = normalize_linkedin_url(linkedin_url)
+    if linkedin:
+        keys["li"] = _hash(f"li:{linkedin}")
+    email = normalize_email(email)
+    if email:
+        keys["em"] = _hash(f"em:{email}")
+    if not keys and name and domain:
+        keys["nd"] = _hash(f"nd:{normalize_name(name)}@{domain}")
+    return keys
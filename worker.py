@@ -0,0 +1,46 @@
+"""
+Enrichment Worker
+=================
+Claims lead batches from the durable work queue (filled by
+`python main.py --enqueue <job>`), enriches them through pipe0 and commits
+the results. Run as many workers as you like on the host that holds the
+queue database; expired leases are reclaimed automatically. The queue
+(and the pipe0 dispatch slots) are single-host: SQLite's WAL mode needs
+shared memory and doesn't work over a network filesystem.
+
+Usage:
+    python worker.py                        # Drain every job, then exit
+    python worker.py --job nightly          # Only work on one job
+    python worker.py --lane backfill        # Schedule pipe0 runs on the backfill lane
+    python worker.py --follow               # Keep polling for new batches
+"""
+
+import argparse
+import logging
+
+from clients.dispatch import LANES, BULK
+from pipeline.worker import run_worker
+from storage.queue import WorkQueue
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    datefmt="%H:%M:%S",
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lead enrichment queue worker")
+    parser.add_argument("--job", help="Only claim batches from this job")
+    parser.add_argument("--lane", choices=LANES, default=BULK, help="pipe0 dispatch lane")
+    parser.add_argument("--worker-id", help="Lease owner name (default: host:pid:random)")
+    parser.add_argument("--follow", action="store_true", help="Keep polling instead of exiting when drained")
+    parser.add_argument("--queue-db", help="Path to the queue database (default: QUEUE_DB_PATH)")
+    args = parser.parse_args()
+
+    queue = WorkQueue(args.queue_db)
+    run_worker(queue, job=args.job, lane=args.lane, owner=args.worker_id, follow=args.follow)
+
+
+if __name__ == "__main__":
+    main()